@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 
-import hashlib
 import os
 import argparse
 from typing import Optional, Dict, Any
@@ -23,7 +22,7 @@ class ALSAConfig:
     def __init__(self, filename='/etc/asound.conf'):
         self.filename = filename
         self.config = ""
-        self.original_checksum = ""
+        self._original_config = ""
         self.load_config()
 
     def load_config(self):
@@ -33,11 +32,7 @@ class ALSAConfig:
                 self.config = file.read()
         else:
             self.config = ""  # Initialize as empty if the file does not exist
-        self.original_checksum = self.calculate_checksum()
-
-    def calculate_checksum(self):
-        """ Calculate MD5 checksum of the current configuration. """
-        return hashlib.md5(self.config.encode('utf-8')).hexdigest()
+        self._original_config = self.config
 
     def create_simple_config(self, hw, channels):
         """ Create a simple ALSA configuration using the predefined template. """
@@ -45,11 +40,10 @@ class ALSAConfig:
 
     def save(self):
         """ Save the configuration to disk only if it has changed. """
-        current_checksum = self.calculate_checksum()
-        if current_checksum != self.original_checksum:
+        if self.config != self._original_config:
             with open(self.filename, 'w') as file:
                 file.write(self.config)
-            self.original_checksum = current_checksum
+            self._original_config = self.config
             return True
         return False
 
@@ -6,13 +6,30 @@ This module provides functionality to configure the Avahi daemon
 to only advertise on physical network interfaces (eth*, wlan*).
 """
 
+import io
 import os
+import re
 import sys
 import argparse
 import logging
 import shutil
 import subprocess
 
+try:
+    import dbus
+except ImportError:
+    dbus = None
+
+AVAHI_SERVICE = "avahi-daemon.service"
+AVAHI_CONF = "/etc/avahi/avahi-daemon.conf"
+ALLOW_INTERFACES_LINE = 'allow-interfaces=eth0,wlan0\n'
+
+# Classifies a config line in one match: group 1 is a section header,
+# group 2 an (optionally commented) allow-/deny-interfaces setting
+_LINE_RE = re.compile(r'^\s*(?:(\[[^\]]+\])|(#?\s*(?:allow|deny)-interfaces\s*=))')
+_ALLOW_LINE_RE = re.compile(r'^\s*allow-interfaces=eth0,wlan0\s*$', re.MULTILINE)
+_DENY_LINE_RE = re.compile(r'^\s*deny-interfaces\s*=', re.MULTILINE)
+
 
 def setup_logging(verbose=False):
     """Setup logging configuration"""
@@ -24,96 +41,142 @@ def setup_logging(verbose=False):
     )
 
 
-def configure_avahi_interfaces():
+def _systemd_manager():
+    """
+    Connect to the systemd manager over the system D-Bus
+
+    Returns:
+        Tuple (bus, manager interface), or (None, None) if D-Bus is not usable
+    """
+    if dbus is None:
+        return None, None
+    try:
+        bus = dbus.SystemBus()
+        manager = dbus.Interface(
+            bus.get_object('org.freedesktop.systemd1', '/org/freedesktop/systemd1'),
+            'org.freedesktop.systemd1.Manager'
+        )
+        return bus, manager
+    except dbus.DBusException as e:
+        logging.debug(f"systemd not reachable over D-Bus, falling back to systemctl: {e}")
+        return None, None
+
+
+def _is_unit_active(unit):
+    """Check if a systemd unit is active, preferring D-Bus over spawning systemctl"""
+    bus, manager = _systemd_manager()
+    if manager is not None:
+        try:
+            unit_path = manager.LoadUnit(unit)
+            properties = dbus.Interface(bus.get_object('org.freedesktop.systemd1', unit_path),
+                                        'org.freedesktop.DBus.Properties')
+            return str(properties.Get('org.freedesktop.systemd1.Unit', 'ActiveState')) == 'active'
+        except dbus.DBusException as e:
+            logging.debug(f"D-Bus query for {unit} failed, falling back to systemctl: {e}")
+
+    result = subprocess.run(
+        ['systemctl', 'is-active', unit],
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    return result.returncode == 0
+
+
+def _unit_action(action, unit):
+    """
+    Start or restart a systemd unit
+
+    This goes through systemctl rather than D-Bus: StartUnit/RestartUnit
+    return as soon as the job is queued, while systemctl waits for the job
+    and fails if the unit doesn't come up (e.g. with a broken config).
+
+    Args:
+        action: 'start' or 'restart'
+        unit: Name of the systemd unit
+
+    Returns:
+        Tuple (success, error message)
+    """
+    result = subprocess.run(
+        ['systemctl', action, unit],
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    return result.returncode == 0, result.stderr.strip()
+
+
+def _is_configured(text):
+    """Check if avahi-daemon.conf content already has our interface restriction"""
+    return _ALLOW_LINE_RE.search(text) is not None and _DENY_LINE_RE.search(text) is None
+
+
+def _rewrite_avahi_config(text):
+    """
+    Return avahi-daemon.conf content with our interface restriction applied
+
+    Existing (possibly commented) allow-interfaces/deny-interfaces lines in the
+    [server] section are dropped and a single allow-interfaces line is placed
+    at the end of that section. The file is scanned once.
+    """
+    out = io.StringIO()
+    in_server_section = False
+    last_line = ''
+
+    for line in text.splitlines(keepends=True):
+        match = _LINE_RE.match(line)
+        if match is not None:
+            header = match.group(1)
+            if header is not None:
+                # End of server section, add our config
+                if in_server_section and header != '[server]':
+                    out.write(ALLOW_INTERFACES_LINE)
+                in_server_section = header == '[server]'
+            elif in_server_section:
+                continue
+
+        out.write(line)
+        last_line = line
+
+    # If we're still in server section at end of file, add our config
+    if in_server_section:
+        if last_line and not last_line.endswith('\n'):
+            out.write('\n')
+        out.write(ALLOW_INTERFACES_LINE)
+
+    return out.getvalue()
+
+
+def configure_avahi_interfaces(avahi_conf=AVAHI_CONF):
     """
     Configure Avahi daemon to only advertise on physical interfaces (eth*, wlan*)
     
     This function modifies /etc/avahi/avahi-daemon.conf to:
     - Allow only physical ethernet and wireless interfaces
     
+    Args:
+        avahi_conf: Path to the Avahi daemon configuration file
+
     Returns:
         True if successful, False otherwise
     """
-    avahi_conf = "/etc/avahi/avahi-daemon.conf"
-    
     try:
-        # Check if Avahi is installed
-        if not os.path.exists(avahi_conf):
+        # Read current configuration, a missing file means Avahi isn't installed
+        try:
+            with open(avahi_conf, 'r') as f:
+                text = f.read()
+        except FileNotFoundError:
             logging.info("Avahi daemon not installed, skipping configuration")
             return True
-        
-        # Read current configuration
-        with open(avahi_conf, 'r') as f:
-            lines = f.readlines()
-        
-        # Track if we need to modify the file
-        modified = False
-        new_lines = []
-        in_server_section = False
-        found_allow_interfaces = False
-        found_deny_interfaces = False
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Track if we're in the [server] section
-            if stripped.startswith('[server]'):
-                in_server_section = True
-                new_lines.append(line)
-                continue
-            elif stripped.startswith('[') and stripped.endswith(']'):
-                in_server_section = False
-                new_lines.append(line)
-                continue
-            
-            # Skip existing allow-interfaces and deny-interfaces lines
-            if in_server_section and (stripped.startswith('allow-interfaces=') or 
-                                    stripped.startswith('#allow-interfaces=')):
-                found_allow_interfaces = True
-                modified = True
-                continue
-            elif in_server_section and (stripped.startswith('deny-interfaces=') or 
-                                       stripped.startswith('#deny-interfaces=')):
-                found_deny_interfaces = True
-                modified = True
-                continue
-            
-            new_lines.append(line)
-        
-        # Add our interface configuration to the [server] section
-        if in_server_section or not found_allow_interfaces:
-            # Find the [server] section and add our configuration
-            final_lines = []
-            in_server_section = False
-            server_section_processed = False
-            
-            for line in new_lines:
-                stripped = line.strip()
-                
-                if stripped.startswith('[server]'):
-                    in_server_section = True
-                    server_section_processed = False
-                    final_lines.append(line)
-                    continue
-                elif stripped.startswith('[') and stripped.endswith(']'):
-                    # End of server section, add our config if not already done
-                    if in_server_section and not server_section_processed:
-                        final_lines.append('allow-interfaces=eth0,wlan0\n')
-                        server_section_processed = True
-                        modified = True
-                    in_server_section = False
-                    final_lines.append(line)
-                    continue
-                
-                final_lines.append(line)
-            
-            # If we're still in server section at end of file, add our config
-            if in_server_section and not server_section_processed:
-                final_lines.append('allow-interfaces=eth0,wlan0\n')
-                modified = True
-            
-            new_lines = final_lines
-        
+
+        if _is_configured(text):
+            logging.info("Avahi configuration already correct")
+            return True
+
+        new_text = _rewrite_avahi_config(text)
+        modified = new_text != text
+
         # Write the modified configuration if changes were made
         if modified:
             # Create backup
@@ -124,7 +187,7 @@ def configure_avahi_interfaces():
             
             # Write new configuration
             with open(avahi_conf, 'w') as f:
-                f.writelines(new_lines)
+                f.write(new_text)
             
             logging.info("Updated Avahi configuration to only advertise on physical interfaces")
             
@@ -132,41 +195,24 @@ def configure_avahi_interfaces():
             logging.info("Restarting Avahi daemon to apply configuration changes")
             try:
                 # First check if the service is active
-                check_result = subprocess.run(
-                    ['systemctl', 'is-active', 'avahi-daemon'],
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if check_result.returncode == 0:
+                if _is_unit_active(AVAHI_SERVICE):
                     # Service is active, restart it
-                    result = subprocess.run(
-                        ['systemctl', 'restart', 'avahi-daemon'],
-                        capture_output=True,
-                        text=True,
-                        check=False
-                    )
-                    
-                    if result.returncode == 0:
+                    success, error = _unit_action('restart', AVAHI_SERVICE)
+
+                    if success:
                         logging.info("Restarted Avahi daemon successfully")
                     else:
-                        logging.warning(f"Failed to restart Avahi daemon: {result.stderr.strip()}")
+                        logging.warning(f"Failed to restart Avahi daemon: {error}")
                         return False
                 else:
                     # Service is not active, try to start it
                     logging.info("Avahi daemon is not running, attempting to start it")
-                    result = subprocess.run(
-                        ['systemctl', 'start', 'avahi-daemon'],
-                        capture_output=True,
-                        text=True,
-                        check=False
-                    )
-                    
-                    if result.returncode == 0:
+                    success, error = _unit_action('start', AVAHI_SERVICE)
+
+                    if success:
                         logging.info("Started Avahi daemon successfully")
                     else:
-                        logging.warning(f"Failed to start Avahi daemon: {result.stderr.strip()}")
+                        logging.warning(f"Failed to start Avahi daemon: {error}")
                         logging.info("Configuration updated but daemon could not be started")
                         # Don't return False here as the configuration was still updated
                         
@@ -226,24 +272,22 @@ def main():
     
     if args.check_only:
         # Just check current configuration
-        avahi_conf = "/etc/avahi/avahi-daemon.conf"
-        if not os.path.exists(avahi_conf):
-            print("Avahi daemon not installed")
-            return 0
-        
         try:
-            with open(avahi_conf, 'r') as f:
+            with open(AVAHI_CONF, 'r') as f:
                 content = f.read()
-                
-            if 'allow-interfaces=eth0,wlan0' in content:
-                print("Avahi configuration is correct - only advertising on physical interfaces")
-                return 0
-            else:
-                print("Avahi configuration needs updating")
-                return 1
+        except FileNotFoundError:
+            print("Avahi daemon not installed")
+            return 0
         except Exception as e:
             logging.error(f"Error reading Avahi configuration: {e}")
             return 1
+
+        if _is_configured(content):
+            print("Avahi configuration is correct - only advertising on physical interfaces")
+            return 0
+        else:
+            print("Avahi configuration needs updating")
+            return 1
     else:
         # Configure Avahi
         if configure_avahi_interfaces():
@@ -1,30 +1,64 @@
 import logging
 import sys
-import os
-import configparser
+import re
+import threading
+import time
 from pathlib import Path
 import dbus
 
+BLUETOOTH_CONF = Path("~/.config/hifiberry/bluetooth.conf").expanduser()
+
+# bluetooth.conf is a flat ini file ("[Bluetooth]" plus key=value lines), so
+# two regular expressions are all that is needed to parse it.
+_SECTION_RE = re.compile(r'^\[([^\]]+)\]\s*$')
+_KEY_VALUE_RE = re.compile(r'^([^=;#\s][^=]*?)\s*=\s*(.*)$')
+
+_BOOLEAN_STATES = {
+    "1": True, "yes": True, "true": True, "on": True,
+    "0": False, "no": False, "false": False, "off": False,
+}
+
+
+def _to_bool(value):
+    """Convert an ini value to a bool, accepting the same words as configparser"""
+    try:
+        return _BOOLEAN_STATES[str(value).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value}")
+
+
+# Settings of the [Bluetooth] section: key -> (converter, default)
+_BLUETOOTH_SETTINGS = {
+    "capability": (str, "KeyboardDisplay"),
+    "discoverable": (_to_bool, True),
+    "discoverable_timeout": (int, 0),
+    "pairable": (_to_bool, True),
+    "pairable_timeout": (int, 0),
+}
+
 # From the user's script
 class ConfigFileManager:
-    config_path = "~/.config/hifiberry/bluetooth.conf"
-    config_path = Path(config_path).expanduser()
+    config_path = BLUETOOTH_CONF
+    _logger_initialized = False
 
     def __init__(self):
         # Set up logger
         self.logger = logging.getLogger("hbos-bluetooth-service")
-        self.logger.setLevel(logging.DEBUG)
-        if not self.logger.handlers:
-            handler = logging.StreamHandler(sys.stdout)
-            formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+        if not ConfigFileManager._logger_initialized:
+            self.logger.setLevel(logging.DEBUG)
+            if not self.logger.handlers:
+                handler = logging.StreamHandler(sys.stdout)
+                formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+                handler.setFormatter(formatter)
+                self.logger.addHandler(handler)
+            ConfigFileManager._logger_initialized = True
 
         self.logger.info("Initializing ConfigFileManager...")
 
 
-        self.config_file = Path(self.config_path)
+        self.config_file = self.config_path
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
+        self.mtime = None
 
         if not self.config_file.exists():
             self.create_config_file()
@@ -34,28 +68,62 @@ class ConfigFileManager:
     def create_config_file(self):
         try:
             # Create parent directories if they don't exist
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+            self.config_file.parent.mkdir(parents=True, exist_ok=True)
 
             # Create the file
-            with open(self.config_path, "w") as f:
+            with open(self.config_file, "w") as f:
                 f.write("[Bluetooth]\n")
                 f.write("capability=NoInputNoOutput\n")
-            self.logger.info(f"Created config file: {self.config_path}")
+            self.logger.info(f"Created config file: {self.config_file}")
 
         except Exception as e:
             self.logger.error(f"Error creating config file: {e}")
 
-    def load_config_values(self):
-        self.config = configparser.ConfigParser()
-        self.config.read(self.config_file)
+    def _file_mtime(self):
+        """Return the config file's modification time, or None if it is missing"""
+        try:
+            return self.config_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def is_stale(self):
+        """Check if the config file was modified since it was last read or written"""
+        return self._file_mtime() != self.mtime
 
-        self.capability = self.config.get("Bluetooth", "capability", fallback="KeyboardDisplay")
+    def _read_config(self):
+        """Parse the config file into a {section: {key: value}} dict"""
+        data = {}
+        section = None
+        self.mtime = self._file_mtime()
+        try:
+            lines = self.config_file.read_text().splitlines()
+        except FileNotFoundError:
+            return data
+
+        for line in lines:
+            line = line.strip()
+            match = _SECTION_RE.match(line)
+            if match:
+                section = data.setdefault(match.group(1), {})
+                continue
+            match = _KEY_VALUE_RE.match(line)
+            if match and section is not None:
+                section[match.group(1).lower()] = match.group(2)
+        return data
 
-        self.discoverable = self.config.getboolean("Bluetooth", "discoverable", fallback="True")
-        self.discoverable_timeout = self.config.getint("Bluetooth", "discoverable_timeout", fallback="0")
+    def _write_config(self):
+        """Write all sections back to the config file"""
+        with open(self.config_file, 'w') as configfile:
+            for section, values in self.config.items():
+                configfile.write(f"[{section}]\n")
+                for key, value in values.items():
+                    configfile.write(f"{key}={value}\n")
+                configfile.write("\n")
+        self.mtime = self._file_mtime()
 
-        self.pairable = self.config.getboolean("Bluetooth", "pairable", fallback="True")
-        self.pairable_timeout = self.config.getint("Bluetooth", "pairable_timeout", fallback="0")
+    def load_config_values(self):
+        self.config = self._read_config()
+        self._update_values()
 
         self.logger.info(f"Bluetooth capability: {self.capability}")
         self.logger.info(f"Discoverable: {self.discoverable}")
@@ -63,18 +131,59 @@ class ConfigFileManager:
         self.logger.info(f"Pairable: {self.pairable}")
         self.logger.info(f"Pairable timeout: {self.pairable_timeout}")
 
+    def _update_values(self):
+        """Convert the [Bluetooth] settings once into typed values"""
+        values = self.config.get("Bluetooth", {})
+        self._values = {
+            key: convert(values[key]) if key in values else default
+            for key, (convert, default) in _BLUETOOTH_SETTINGS.items()
+        }
+
+    @property
+    def capability(self):
+        return self._values["capability"]
+
+    @property
+    def discoverable(self):
+        return self._values["discoverable"]
+
+    @property
+    def discoverable_timeout(self):
+        return self._values["discoverable_timeout"]
+
+    @property
+    def pairable(self):
+        return self._values["pairable"]
+
+    @property
+    def pairable_timeout(self):
+        return self._values["pairable_timeout"]
+
     def set_config_value(self, section, key, value):
+        self.set_config_values(section, {key: value})
+
+    def set_config_values(self, section, values):
+        """Set several keys of a section and write the file once.
+
+        All values are validated before anything is changed, so an invalid
+        value leaves both the file and the cached settings untouched.
+        """
         try:
-            if not self.config.has_section(section):
-                self.config.add_section(section)
+            values = {key.lower(): str(value) for key, value in values.items()}
+            converted = {}
+            if section == "Bluetooth":
+                for key, value in values.items():
+                    if key in _BLUETOOTH_SETTINGS:
+                        converted[key] = _BLUETOOTH_SETTINGS[key][0](value)
 
-            self.config.set(section, key, value)
+            self.config.setdefault(section, {}).update(values)
 
             # Save changes to file
-            with open(self.config_file, 'w') as configfile:
-                self.config.write(configfile)
+            self._write_config()
+            self._values.update(converted)
 
-            self.logger.info(f"Set {section}.{key} = {value}")
+            for key, value in values.items():
+                self.logger.info(f"Set {section}.{key} = {value}")
 
         except Exception as e:
             self.logger.error(f"Error setting config value: {e}")
@@ -84,11 +193,24 @@ class ConfigFileManager:
             self.logger.info(f"pairable: {self.pairable}")
             self.logger.info(f"pairable_timeout: {self.pairable_timeout}")
 
+# Shared ConfigFileManager, re-created only when bluetooth.conf changes on disk
+_config_file_manager = None
+_config_file_manager_lock = threading.Lock()
+
+
+def _get_config_file_manager():
+    """Return the cached ConfigFileManager, reloading it if the file changed."""
+    global _config_file_manager
+    with _config_file_manager_lock:
+        if _config_file_manager is None or _config_file_manager.is_stale():
+            _config_file_manager = ConfigFileManager()
+        return _config_file_manager
+
 # New functions based on the user's Flask routes
 
 def get_bluetooth_settings():
     """Returns bluetooth settings."""
-    cfm = ConfigFileManager()
+    cfm = _get_config_file_manager()
     return {
         "capability": cfm.capability,
         "discoverable": cfm.discoverable,
@@ -99,7 +221,7 @@ def get_bluetooth_settings():
 
 def set_bluetooth_settings(settings):
     """Sets bluetooth settings."""
-    cfm = ConfigFileManager()
+    cfm = _get_config_file_manager()
     valid_keys = [
         "capability",
         "discoverable",
@@ -107,33 +229,120 @@ def set_bluetooth_settings(settings):
         "pairable",
         "pairable_timeout",
     ]
+    values = {}
     for key in valid_keys:
         if key in settings:
             value = settings.get(key)
             if key in ["discoverable_timeout", "pairable_timeout"] and value == "":
                 value = "0"
-            cfm.set_config_value("Bluetooth", key, value)
+            values[key] = value
+    if values:
+        cfm.set_config_values("Bluetooth", values)
     return get_bluetooth_settings()
 
 
+# bluez ObjectManager state is cached briefly so back-to-back device queries
+# (e.g. list followed by unpair) don't each marshal the full object tree
+MANAGED_OBJECTS_TTL = 1.0
+_managed_objects_cache = None
+
+# Adapters tried by unpair_device before falling back to a full object scan
+DIRECT_UNPAIR_ADAPTERS = ("hci0", "hci1")
+
+# D-Bus connection and bluez proxies, created on first use. Proxies are bound
+# to bluetoothd's current bus name, so they are dropped along with the
+# connection via _reset_dbus() when a call fails (e.g. after bluetoothd or
+# dbus was restarted).
+_bus = None
+_object_manager = None
+_adapters = {}
+
+
+def _get_bus():
+    """Return the shared system bus connection."""
+    global _bus
+    if _bus is None:
+        _bus = dbus.SystemBus()
+    return _bus
+
+
+def _get_object_manager():
+    """Return the cached bluez ObjectManager interface."""
+    global _object_manager
+    if _object_manager is None:
+        _object_manager = dbus.Interface(_get_bus().get_object("org.bluez", "/"),
+                                         "org.freedesktop.DBus.ObjectManager")
+    return _object_manager
+
+
+def _get_adapter(adapter_path):
+    """Return the cached bluez Adapter1 interface for an adapter object path."""
+    adapter = _adapters.get(adapter_path)
+    if adapter is None:
+        adapter = dbus.Interface(_get_bus().get_object("org.bluez", adapter_path),
+                                 "org.bluez.Adapter1")
+        _adapters[adapter_path] = adapter
+    return adapter
+
+
+def _reset_dbus():
+    """Forget the bus connection and all bluez proxies so they are re-created on next use."""
+    global _bus, _object_manager
+    if _bus is not None:
+        try:
+            # SystemBus() hands out a shared connection; closing a dead one
+            # removes it from dbus-python's shared instances, so the next
+            # SystemBus() call connects again
+            if not _bus.get_is_connected():
+                _bus.close()
+        except dbus.DBusException:
+            pass
+    _bus = None
+    _object_manager = None
+    _adapters.clear()
+
+
+def _get_managed_objects(ttl=MANAGED_OBJECTS_TTL):
+    """Return bluez's managed objects, reusing a result younger than ttl seconds."""
+    global _managed_objects_cache
+    now = time.monotonic()
+    if _managed_objects_cache is not None and now - _managed_objects_cache[0] < ttl:
+        return _managed_objects_cache[1]
+
+    try:
+        objects = _get_object_manager().GetManagedObjects()
+    except dbus.DBusException:
+        # The proxy may point to a bluetoothd instance that is gone, retry once
+        _reset_dbus()
+        objects = _get_object_manager().GetManagedObjects()
+    _managed_objects_cache = (now, objects)
+    return objects
+
+
+def _invalidate_managed_objects():
+    """Drop the cached managed objects after bluez state was changed."""
+    global _managed_objects_cache
+    _managed_objects_cache = None
+
+
 def get_paired_devices():
     """Returns a list of paired bluetooth devices."""
-    bus = dbus.SystemBus()
-    manager = dbus.Interface(bus.get_object("org.bluez", "/"),
-                             "org.freedesktop.DBus.ObjectManager")
-    objects = manager.GetManagedObjects()
+    objects = _get_managed_objects()
     devices = []
 
-    for path, interfaces in objects.items():
-        if "org.bluez.Device1" in interfaces:
-            device = interfaces["org.bluez.Device1"]
-            if device.get("Paired", False):
-                devices.append({
-                    "name": str(device.get("Name", "Unknown")),
-                    "address": str(device.get("Address")),
-                    "connected": bool(device.get("Connected", False)),
-                    "trusted": bool(device.get("Trusted", False)),
-                })
+    append = devices.append
+
+    for interfaces in objects.values():
+        device = interfaces.get("org.bluez.Device1")
+        if not device or not device.get("Paired", False):
+            continue
+        get = device.get
+        append({
+            "name": str(get("Name", "Unknown")),
+            "address": str(get("Address")),
+            "connected": bool(get("Connected", False)),
+            "trusted": bool(get("Trusted", False)),
+        })
     return devices
 
 def unpair_device(address):
@@ -142,10 +351,24 @@ def unpair_device(address):
         raise ValueError("Missing 'address' query parameter")
 
     address = address.upper()
-    bus = dbus.SystemBus()
-    manager = dbus.Interface(bus.get_object("org.bluez", "/"),
-                             "org.freedesktop.DBus.ObjectManager")
-    objects = manager.GetManagedObjects()
+
+    # bluez device paths encode the adapter and address
+    # (/org/bluez/hci0/dev_AA_BB_CC_DD_EE_FF), so try removing the device
+    # directly before scanning the whole object tree
+    device_name = "dev_" + address.replace(":", "_")
+    for adapter in DIRECT_UNPAIR_ADAPTERS:
+        adapter_path = f"/org/bluez/{adapter}"
+        try:
+            _get_adapter(adapter_path).RemoveDevice(f"{adapter_path}/{device_name}")
+        except dbus.DBusException as e:
+            if e.get_dbus_name() != "org.bluez.Error.DoesNotExist":
+                # Adapter missing or bluetoothd restarted, don't keep the proxy
+                _adapters.pop(adapter_path, None)
+            continue
+        _invalidate_managed_objects()
+        return {"status": "unpaired", "address": address}
+
+    objects = _get_managed_objects()
 
     # Find the device object path and its adapter
     for path, interfaces in objects.items():
@@ -154,9 +377,8 @@ def unpair_device(address):
             if device.get("Address", "").upper() == address:
                 # Find the adapter this device belongs to
                 adapter_path = "/".join(path.split("/")[:-1])
-                adapter_obj = dbus.Interface(bus.get_object("org.bluez", adapter_path),
-                                             "org.bluez.Adapter1")
-                adapter_obj.RemoveDevice(path)
+                _get_adapter(adapter_path).RemoveDevice(path)
+                _invalidate_managed_objects()
                 return {"status": "unpaired", "address": address}
 
     raise ValueError("Device not found")
@@ -10,7 +10,9 @@ import os
 import glob
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+from .handlers._util import decode_json
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -18,6 +20,13 @@ logger = logging.getLogger(__name__)
 CONFIG_FILE = "/etc/configserver/configserver.json"
 CONFIG_DROP_IN_DIR = "/etc/configserver/conf.d"
 
+# Merged configurations keyed by main config file path. Each entry holds the
+# signature of the files it was built from (see _source_signature) so a
+# cached result is reused until one of those files changes. The merged dict
+# is shared by every ConfigParser for that file, so callers must treat it
+# as read-only.
+_CACHE: Dict[str, Tuple[Tuple, Dict[str, Any]]] = {}
+
 class ConfigParser:
     """Parser for the HiFiBerry Configuration Server config file"""
     
@@ -50,8 +59,8 @@ class ConfigParser:
 
         for path in sorted(glob.glob(os.path.join(drop_in_dir, "*.json"))):
             try:
-                with open(path, 'r') as f:
-                    snippet = json.load(f)
+                with open(path, 'rb') as f:
+                    snippet = decode_json(f.read())
                 if isinstance(snippet, dict):
                     self._deep_merge(config, snippet)
                     logger.debug(f"Merged drop-in config: {path}")
@@ -64,30 +73,63 @@ class ConfigParser:
 
         return config
 
+    def _source_signature(self) -> Tuple:
+        """Return a cheap fingerprint of the config file and its drop-ins.
+
+        The fingerprint is built from stat() results only (mtime and size),
+        so comparing it is much cheaper than re-reading and re-parsing the
+        JSON files.
+        """
+        signature = []
+        paths = [self.config_file]
+        drop_in_dir = os.path.join(os.path.dirname(self.config_file), "conf.d")
+        paths.extend(sorted(glob.glob(os.path.join(drop_in_dir, "*.json"))))
+        for path in paths:
+            try:
+                st = os.stat(path)
+                signature.append((path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
     def load_config(self) -> Dict[str, Any]:
         """
         Load the main configuration file and merge any drop-in files
         from the conf.d/ directory next to it.
 
+        The merged result is cached per config file and only re-read when
+        the config file or one of the drop-ins has been modified. The
+        returned dict is shared and must not be modified.
+
         Returns:
             Dictionary containing the merged configuration data
         """
+        signature = self._source_signature()
+        cached = _CACHE.get(self.config_file)
+        if cached is not None and cached[0] == signature:
+            self._config = cached[1]
+            return self._config
+
+        config = self._read_config()
+        _CACHE[self.config_file] = (signature, config)
+        self._config = config
+        return config
+
+    def _read_config(self) -> Dict[str, Any]:
+        """Read and merge the configuration files, bypassing the cache"""
         try:
             # Load the config file (should be created by debian postinstall)
-            if not os.path.exists(self.config_file):
+            try:
+                with open(self.config_file, 'rb') as f:
+                    config = decode_json(f.read())
+            except FileNotFoundError:
                 logger.error(f"Config file {self.config_file} not found. Please ensure package is properly installed.")
                 return {}
 
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
-
             logger.debug(f"Loaded config from {self.config_file}: {config}")
 
             # Merge drop-in configs
-            config = self._load_drop_ins(config)
-
-            self._config = config
-            return config
+            return self._load_drop_ins(config)
 
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in config file {self.config_file}: {e}")
@@ -99,12 +141,17 @@ class ConfigParser:
     def get_config(self) -> Dict[str, Any]:
         """
         Get the loaded configuration, loading it if necessary
-        
+
+        Once loaded, the configuration is returned without touching the
+        filesystem; use load_config() to pick up changed files or
+        reload_config() to force a re-read. The returned dict is shared
+        and must not be modified.
+
         Returns:
             Dictionary containing the configuration data
         """
         if self._config is None:
-            self._config = self.load_config()
+            self.load_config()
         return self._config
     
     def get_section(self, section: str, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -129,6 +176,7 @@ class ConfigParser:
             Dictionary containing the configuration data
         """
         self._config = None
+        _CACHE.pop(self.config_file, None)
         return self.load_config()
     
     def has_section(self, section: str) -> bool:
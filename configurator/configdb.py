@@ -11,6 +11,8 @@ import sqlite3
 import logging
 import argparse
 import base64
+import threading
+from collections import OrderedDict
 from cryptography.fernet import Fernet
 
 try:
@@ -22,11 +24,73 @@ except ImportError:
 CONFIG_DB = "/var/hifiberry/config.sqlite"
 KEY_FILE = "/etc/configdb.key"
 
+# Maximum number of rows kept in the per-instance read cache
+CACHE_SIZE = 1024
+
+# Number of rows fetched at a time by ConfigDB.iter_all()
+FETCH_BATCH_SIZE = 1000
+
+_NOT_CACHED = object()
+
+# SQL used on the hot paths. Keeping the text identical between calls lets
+# sqlite3's per-connection statement cache hand back the already prepared
+# statement instead of parsing and planning it again.
+SQL_GET = "SELECT value FROM config WHERE key = ?"
+# Upsert that leaves the row (and modified_at) untouched if the value is unchanged
+SQL_SET = (
+    "INSERT INTO config (key, value) VALUES (?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, modified_at = CURRENT_TIMESTAMP "
+    "WHERE config.value IS NOT excluded.value"
+)
+SQL_DELETE = "DELETE FROM config WHERE key = ?"
+SQL_LIST_KEYS = "SELECT key FROM config"
+# Prefix queries use a key range instead of LIKE so SQLite can walk the
+# primary key index; see _prefix_range()
+SQL_LIST_KEYS_PREFIX = "SELECT key FROM config WHERE key >= ? AND key < ?"
+SQL_GET_ALL = "SELECT key, value FROM config"
+SQL_GET_ALL_PREFIX = "SELECT key, value FROM config WHERE key >= ? AND key < ?"
+SQL_DATA_VERSION = "PRAGMA data_version"
+SQL_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS config (
+        key TEXT PRIMARY KEY,
+        value TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# Size of the prepared statement cache of each connection
+CACHED_STATEMENTS = 128
+
+# Bytes of the database file SQLite may memory-map for reads (0 disables)
+MMAP_SIZE = 64 * 1024 * 1024
+
+# Fernet cipher built from KEY_FILE, shared by all ConfigDB instances
+_fernet = None
+_fernet_lock = threading.Lock()
+
+
+def _prefix_range(prefix):
+    """
+    Return (low, high) so that low <= key < high matches keys starting with prefix.
+
+    Keys are compared with BINARY collation, i.e. by code point, so the
+    first string after all keys with this prefix is the prefix with its last
+    character incremented.
+    """
+    return (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+
 class ConfigDB:
     """
     A class to manage key/value pairs in a SQLite database
     """
 
+    # Database paths whose directory was already set up by this process. Later
+    # instances for these paths only connect on first use; the table is
+    # (re)created whenever a connection is opened.
+    _initialized_paths = set()
+
     def __init__(self, db_path=CONFIG_DB):
         """
         Initialize the database connection
@@ -35,10 +99,92 @@ class ConfigDB:
             db_path: Path to the SQLite database file (default: /var/hifiberry/config.sqlite)
         """
         self.db_path = db_path
+        self._conn = None
+        self._lock = threading.RLock()
+        # Rows read through get(), keyed by key; None marks a missing key.
+        # Values are cached as stored, so secure values stay encrypted here
+        # and are only decrypted for callers passing secure=True.
+        self._cache = OrderedDict()
+        self._data_version = None
         self._ensure_db_exists()
-        
+
+    def _connect(self):
+        """
+        Return the shared connection, opening it on first use.
+
+        A single connection is kept for the lifetime of the instance so
+        that individual get/set calls don't pay for opening the database
+        file and setting up the journal every time. The connection runs in
+        autocommit mode and is shared between threads, so every use must
+        hold self._lock.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                                   cached_statements=CACHED_STATEMENTS)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            # Idempotent, and cheap once per connection. Running it here
+            # rather than once per process recreates the table if the
+            # database file was deleted or replaced in the meantime.
+            conn.execute(SQL_CREATE_TABLE)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the shared database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            # data_version is only comparable within a single connection
+            self._cache.clear()
+            self._data_version = None
+
+    def _validate_cache(self, conn):
+        """
+        Drop cached rows if another connection changed the database.
+
+        PRAGMA data_version changes whenever a different connection (in this
+        or another process) commits, but not for our own commits, which
+        update the cache directly. Must be called with self._lock held.
+        """
+        data_version = conn.execute(SQL_DATA_VERSION).fetchone()[0]
+        if data_version != self._data_version:
+            self._cache.clear()
+            self._data_version = data_version
+
+    def refresh(self):
+        """
+        Drop all cached values so the next reads go to the database.
+
+        Changes committed through other connections are picked up
+        automatically, so this is only needed if the database file was
+        replaced or edited behind SQLite's back.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._data_version = None
+
+    def _cache_put(self, key, row):
+        """Store a row in the read cache, evicting the least recently used entry"""
+        self._cache[key] = row
+        self._cache.move_to_end(key)
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def _ensure_db_exists(self):
         """Create the database and table if they don't exist"""
+        if self.db_path in ConfigDB._initialized_paths:
+            return True
+
         db_dir = os.path.dirname(self.db_path)
         if not os.path.exists(db_dir):
             try:
@@ -48,18 +194,10 @@ class ConfigDB:
                 return False
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS config (
-                    key TEXT PRIMARY KEY,
-                    value TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            conn.commit()
-            conn.close()
+            with self._lock:
+                # Opening the connection creates the table
+                self._connect()
+            ConfigDB._initialized_paths.add(self.db_path)
             return True
         except Exception as e:
             logging.error(f"Couldn't initialize database: {str(e)}")
@@ -69,15 +207,24 @@ class ConfigDB:
         """
         Retrieve the encryption key from the key file. If the file does not exist, create it.
         """
-        if not os.path.exists(KEY_FILE):
+        try:
+            with open(KEY_FILE, "rb") as key_file:
+                return key_file.read()
+        except FileNotFoundError:
             key = Fernet.generate_key()
             with open(KEY_FILE, "wb") as key_file:
                 key_file.write(key)
             os.chmod(KEY_FILE, 0o600)  # Ensure only root can read/write
-        else:
-            with open(KEY_FILE, "rb") as key_file:
-                key = key_file.read()
-        return key
+            return key
+
+    def _get_fernet(self):
+        """Return the Fernet cipher, reading the key file only on first use"""
+        global _fernet
+        if _fernet is None:
+            with _fernet_lock:
+                if _fernet is None:
+                    _fernet = Fernet(self._get_encryption_key())
+        return _fernet
 
     def encrypt_value(self, value):
         """
@@ -89,10 +236,7 @@ class ConfigDB:
         Returns:
             The encrypted value (string).
         """
-        key = self._get_encryption_key()
-        fernet = Fernet(key)
-        encrypted_value = fernet.encrypt(value.encode())
-        return encrypted_value.decode()
+        return self._get_fernet().encrypt(value.encode()).decode()
 
     def decrypt_value(self, encrypted_value):
         """
@@ -104,10 +248,7 @@ class ConfigDB:
         Returns:
             The decrypted value (string).
         """
-        key = self._get_encryption_key()
-        fernet = Fernet(key)
-        decrypted_value = fernet.decrypt(encrypted_value.encode())
-        return decrypted_value.decode()
+        return self._get_fernet().decrypt(encrypted_value.encode()).decode()
 
     def get(self, key, default=None, secure=False):
         """
@@ -122,11 +263,13 @@ class ConfigDB:
             The value for the key or default if not found
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT value FROM config WHERE key = ?", (key,))
-            result = cursor.fetchone()
-            conn.close()
+            with self._lock:
+                conn = self._connect()
+                self._validate_cache(conn)
+                result = self._cache.get(key, _NOT_CACHED)
+                if result is _NOT_CACHED:
+                    result = conn.execute(SQL_GET, (key,)).fetchone()
+                self._cache_put(key, result)
 
             if result:
                 value = result[0]
@@ -154,31 +297,60 @@ class ConfigDB:
             if secure:
                 value = self.encrypt_value(value)
 
-            # First check if the current value matches the new value
-            current_value = self.get(key, secure=secure)
-            if current_value == value:
-                logging.debug(f"Value for {key} is already '{value}', skipping update")
-                return True
-
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO config (key, value, modified_at) 
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', (key, value))
-            conn.commit()
-            conn.close()
-
-            if current_value is not None:
-                logging.debug(f"Updated key {key} from '{current_value}' to '{value}'")
+            # Single statement: SQLite itself skips the update if the value is unchanged
+            with self._lock:
+                changed = self._connect().execute(SQL_SET, (key, value)).rowcount
+                self._cache_put(key, (value,))
+
+            if changed:
+                logging.debug(f"Set key {key} to '{value}'")
             else:
-                logging.debug(f"Created new key {key} with value '{value}'")
+                logging.debug(f"Value for {key} is already '{value}', skipping update")
 
             return True
         except Exception as e:
             logging.error(f"Error setting key {key}: {str(e)}")
             return False
 
+    def set_many(self, pairs, secure=False):
+        """
+        Store several key/value pairs in a single transaction.
+
+        Callers writing more than one key should use this instead of
+        repeated set() calls: all rows are committed together, so the
+        database is synced to disk once rather than once per key.
+
+        Args:
+            pairs: Iterable of (key, value) tuples
+            secure: Whether to encrypt the values
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if secure:
+                pairs = [(key, self.encrypt_value(value)) for key, value in pairs]
+            else:
+                pairs = list(pairs)
+
+            with self._lock:
+                conn = self._connect()
+                # Take the write lock up front so a concurrent writer can't
+                # make us fail halfway through the batch
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(SQL_SET, pairs)
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+                for key, value in pairs:
+                    self._cache_put(key, (value,))
+            return True
+        except Exception as e:
+            logging.error(f"Error setting keys: {str(e)}")
+            return False
+
     def delete(self, key):
         """
         Delete a key from the database
@@ -190,11 +362,9 @@ class ConfigDB:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM config WHERE key = ?", (key,))
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self._connect().execute(SQL_DELETE, (key,))
+                self._cache_put(key, None)
             return True
         except Exception as e:
             logging.error(f"Error deleting key {key}: {str(e)}")
@@ -211,17 +381,14 @@ class ConfigDB:
             List of keys
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            if prefix:
-                cursor.execute("SELECT key FROM config WHERE key LIKE ?", (prefix + "%",))
-            else:
-                cursor.execute("SELECT key FROM config")
-                
-            keys = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            return keys
+            with self._lock:
+                conn = self._connect()
+                if prefix:
+                    cursor = conn.execute(SQL_LIST_KEYS_PREFIX, _prefix_range(prefix))
+                else:
+                    cursor = conn.execute(SQL_LIST_KEYS)
+                # Unpack straight from the cursor, no intermediate list of rows
+                return [key for key, in cursor]
         except Exception as e:
             logging.error(f"Error listing keys: {str(e)}")
             return []
@@ -234,18 +401,55 @@ class ConfigDB:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM config")
-            count = cursor.rowcount
-            conn.commit()
-            conn.close()
+            with self._lock:
+                count = self._connect().execute("DELETE FROM config").rowcount
+                self._cache.clear()
             logging.info(f"Cleared all {count} keys from config database")
             return True
         except Exception as e:
             logging.error(f"Error clearing config database: {str(e)}")
             return False
 
+    def _iter_batches(self, prefix=None):
+        """
+        Yield lists of (key, value) rows, FETCH_BATCH_SIZE rows at a time
+
+        The connection lock is only held while a batch is fetched, not for
+        the whole scan.
+        """
+        with self._lock:
+            conn = self._connect()
+            if prefix:
+                cursor = conn.execute(SQL_GET_ALL_PREFIX, _prefix_range(prefix))
+            else:
+                cursor = conn.execute(SQL_GET_ALL)
+
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+            if not rows:
+                break
+            yield rows
+
+    def iter_all(self, prefix=None):
+        """
+        Iterate over all key/value pairs, optionally filtered by prefix
+
+        Rows are fetched in batches of FETCH_BATCH_SIZE instead of being
+        loaded all at once, so memory use stays flat for large tables.
+
+        Args:
+            prefix: Optional prefix to filter keys
+
+        Yields:
+            (key, value) tuples
+        """
+        try:
+            for rows in self._iter_batches(prefix):
+                yield from rows
+        except Exception as e:
+            logging.error(f"Error iterating keys: {str(e)}")
+
     def get_all(self, prefix=None):
         """
         Get all key/value pairs, optionally filtered by prefix
@@ -257,16 +461,9 @@ class ConfigDB:
             Dictionary of key/value pairs
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            if prefix:
-                cursor.execute("SELECT key, value FROM config WHERE key LIKE ?", (prefix + "%",))
-            else:
-                cursor.execute("SELECT key, value FROM config")
-                
-            result = {row[0]: row[1] for row in cursor.fetchall()}
-            conn.close()
+            result = {}
+            for rows in self._iter_batches(prefix):
+                result.update(rows)
             return result
         except Exception as e:
             logging.error(f"Error getting all keys: {str(e)}")
@@ -414,6 +611,8 @@ def main():
     # Create arguments for the different commands
     parser.add_argument('--get', metavar='KEY', help='Get a value from the configuration')
     parser.add_argument('--set', nargs=2, metavar=('KEY', 'VALUE'), help='Set a key/value pair')
+    parser.add_argument('--set-many', nargs='+', metavar='KEY=VALUE',
+                        help='Set several key/value pairs in one transaction')
     parser.add_argument('--delete', metavar='KEY', help='Delete a key')
     parser.add_argument('--list', action='store_true', help='List all keys')
     parser.add_argument('--dump', action='store_true', help='Dump all key/value pairs')
@@ -455,6 +654,20 @@ def main():
             return 1
         return 0
             
+    # --set-many command
+    elif args.set_many:
+        pairs = []
+        for item in args.set_many:
+            key, sep, value = item.partition('=')
+            if not sep or not key:
+                logging.error(f"Invalid KEY=VALUE pair: {item}")
+                return 1
+            pairs.append((key, value))
+        if not db.set_many(pairs):
+            logging.error("Failed to set keys")
+            return 1
+        return 0
+
     # --delete command
     elif args.delete:
         success = db.delete(args.delete)
@@ -472,8 +685,7 @@ def main():
             
     # --dump command
     elif args.dump:
-        entries = db.get_all(args.prefix)
-        for key, value in entries.items():
+        for key, value in db.iter_all(args.prefix):
             print(f"{key}={value}")
         return 0
     
@@ -515,8 +727,7 @@ def main():
                 
         elif args.command == 'dump':
             prefix = args.args[0] if args.args else None
-            entries = db.get_all(prefix)
-            for key, value in entries.items():
+            for key, value in db.iter_all(prefix):
                 print(f"{key}={value}")
             return 0
     
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 
+import io
 import os
 import shutil
-import hashlib
 import logging
 import argparse
 from typing import Optional
-from .soundcard import Soundcard
+from .soundcard import Soundcard, SOUND_CARD_DEFINITIONS
 from .pimodel import PiModel
 
 # Constants
@@ -14,6 +14,18 @@ HIFIBERRY_DETECTION_DISABLED = "# HiFiBerry sound detection disabled"
 DWC2_PREFIX = "dtoverlay=dwc2"
 DWC2_PERIPHERAL = "dtoverlay=dwc2,dr_mode=peripheral\n"
 DWC2_HOST = "dtoverlay=dwc2,dr_mode=host\n"
+HAT_I2C_OVERLAY = "dtoverlay=i2c-gpio,i2c_gpio_sda=0,i2c_gpio_scl=1"
+
+# Lines removed by remove_hifiberry_overlays (besides the detection comment)
+HIFIBERRY_LINE_PREFIXES = ("dtoverlay=hifiberry", "# HiFiBerry card:", "force_eeprom_read=")
+
+# prefix -> line set by default_config, in the order missing lines are appended
+DEFAULT_CONFIG_LINES = {
+    "dtparam=audio=": "dtparam=audio=off\n",
+    "force_eeprom_read=": "force_eeprom_read=1\n",
+    "dtparam=spi=": "dtparam=spi=on\n",
+    "dtparam=i2c_arm=": "dtparam=i2c_arm=on\n",
+}
 
 # Pi model version -> the config.txt model section it boots from, for models
 # that have one. Models not listed here have no dedicated model section.
@@ -34,19 +46,25 @@ class ConfigTxt:
         self.file_path = file_path
         self.lines = []
         self.changes_made = False
-        self.original_checksum = None
+        self._original_lines = []
         self._read_file()
 
     def _read_file(self):
-        """Reads the content of the config file into the buffer and computes its checksum."""
-        if not os.path.exists(self.file_path):
+        """Reads the content of the config file into the buffer and keeps a snapshot of it."""
+        try:
+            with open(self.file_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
             logging.error(f"Config file not found: {self.file_path}")
-            raise FileNotFoundError(f"Config file not found: {self.file_path}")
+            raise FileNotFoundError(f"Config file not found: {self.file_path}") from None
 
-        with open(self.file_path, "r") as file:
-            self.lines = file.readlines()
+        # Decode the whole file once instead of line by line; lines stay str
+        # since other modules edit them directly. Line endings are normalised
+        # to "\n" like text mode reading does, so a CRLF file is saved with
+        # consistent line endings.
+        self.lines = io.StringIO(data.decode("utf-8"), newline=None).readlines()
 
-        self.original_checksum = self._compute_checksum(self.lines)
+        self._original_lines = list(self.lines)
 
     def is_detection_disabled(self):
         """Check if HiFiBerry detection is disabled in config.txt
@@ -79,37 +97,94 @@ class ConfigTxt:
         self.lines.append(f"{HIFIBERRY_DETECTION_DISABLED}\n")
         logging.info("HiFiBerry detection disabled.")
 
-    def _compute_checksum(self, lines):
-        """Computes the checksum of the given lines."""
-        content = "".join(lines).encode("utf-8")
-        return hashlib.sha256(content).hexdigest()
+    def _create_backup(self, backup_path):
+        """Hard-link the current file to backup_path, copying it if linking fails.
+
+        The file itself is replaced rather than rewritten on save, so the link
+        keeps pointing to the old contents. /boot/firmware is usually vfat,
+        which has no hard links, hence the copy fallback.
+        """
+        try:
+            os.remove(backup_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(self.file_path, backup_path)
+        except OSError:
+            shutil.copy2(self.file_path, backup_path)
 
     def save(self):
         """Writes the buffer back to the config file if changes were made and creates a backup if the file has changed."""
-        new_checksum = self._compute_checksum(self.lines)
-        if new_checksum != self.original_checksum:
+        # Unchanged lines are still the objects read from disk, so comparing
+        # against the snapshot is mostly identity checks, no hashing needed
+        if self.lines != self._original_lines:
             backup_path = self.file_path + ".backup"
-            shutil.copy(self.file_path, backup_path)
+            self._create_backup(backup_path)
             logging.info(f"Backup created at: {backup_path}")
 
-            with open(self.file_path, "w") as file:
-                file.writelines(self.lines)
+            # Write a temporary file and rename it over config.txt, so the
+            # file is never left half-written if power is lost mid-save
+            tmp_path = self.file_path + ".tmp"
+            try:
+                with open(tmp_path, "wb") as file:
+                    file.write("".join(self.lines).encode("utf-8"))
+                    file.flush()
+                    os.fsync(file.fileno())
+                shutil.copymode(self.file_path, tmp_path)
+                os.replace(tmp_path, self.file_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+                raise
+            self._fsync_directory()
 
             logging.info("Changes saved to the config file.")
+            self._original_lines = list(self.lines)
             self.changes_made = True
         else:
             self.changes_made = False
 
+    def _fsync_directory(self):
+        """Flushes the config file's directory so a completed rename survives power loss."""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.file_path)), os.O_RDONLY)
+        except OSError as e:
+            logging.debug(f"Could not open config directory for fsync: {e}")
+            return
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            # Not every filesystem supports fsync on a directory
+            logging.debug(f"Could not fsync config directory: {e}")
+        finally:
+            os.close(fd)
+
     def _update_line(self, prefix, new_line):
         """Updates or adds a line with the specified prefix."""
-        updated = False
+        self._update_lines({prefix: new_line})
+
+    def _update_lines(self, updates):
+        """Updates or adds several lines in a single pass over the buffer.
+
+        updates maps a prefix to the line that replaces the first line
+        starting with it. Lines whose prefix wasn't found are appended in
+        the order given.
+        """
+        pending = dict(updates)
+        prefixes = tuple(pending)
         for i, line in enumerate(self.lines):
-            if line.strip().startswith(prefix):
-                self.lines[i] = new_line
-                updated = True
+            stripped = line.strip()
+            if not stripped.startswith(prefixes):
+                continue
+            for prefix in prefixes:
+                if prefix in pending and stripped.startswith(prefix):
+                    self.lines[i] = pending.pop(prefix)
+                    break
+            if not pending:
                 break
-        if not updated:
-            self.lines.append(new_line)
+        self.lines.extend(pending.values())
 
     def _section_bounds(self, section):
         """Return (start, end) line indices of a [section] body, or None if absent.
@@ -158,12 +233,10 @@ class ConfigTxt:
         if bounds is None:
             return
         start, end = bounds
-        kept = [
-            line for i, line in enumerate(self.lines)
-            if not (start <= i < end and line.strip().startswith(prefix))
-        ]
-        if len(kept) != len(self.lines):
-            self.lines = kept
+        # Only lines inside the section need to be stripped and checked
+        body = [line for line in self.lines[start:end] if not line.strip().startswith(prefix)]
+        if len(body) != end - start:
+            self.lines[start:end] = body
             logging.info(f"Removed '{prefix}' from [{section}].")
 
     def disable_onboard_sound(self):
@@ -177,12 +250,13 @@ class ConfigTxt:
     def _update_hdmi_sound(self, mode):
         updated = False
         for i, line in enumerate(self.lines):
-            if line.strip().startswith("dtoverlay=vc4-kms-v3d"):
-                if mode == "noaudio" and ",noaudio" not in line:
-                    self.lines[i] = line.strip() + ",noaudio\n"
+            stripped = line.strip()
+            if stripped.startswith("dtoverlay=vc4-kms-v3d"):
+                if mode == "noaudio" and ",noaudio" not in stripped:
+                    self.lines[i] = stripped + ",noaudio\n"
                     updated = True
-                elif mode == "audio" and ",noaudio" in line:
-                    self.lines[i] = line.replace(",noaudio", "").strip() + "\n"
+                elif mode == "audio" and ",noaudio" in stripped:
+                    self.lines[i] = stripped.replace(",noaudio", "") + "\n"
                     updated = True
 
     def disable_hdmi_sound(self):
@@ -203,21 +277,24 @@ class ConfigTxt:
 
     def enable_overlay(self, overlay, card_name=None, disable_eeprom=False):
         """Enable a device tree overlay, optionally with a card name comment and EEPROM disable"""
+        new_lines = []
         if card_name:
-            self.lines.append(f"# HiFiBerry card: {card_name}\n")
+            new_lines.append(f"# HiFiBerry card: {card_name}\n")
         if disable_eeprom:
-            self.lines.append("force_eeprom_read=0\n")
-        self.lines.append(f"dtoverlay={overlay}\n")
+            new_lines.append("force_eeprom_read=0\n")
+        new_lines.append(f"dtoverlay={overlay}\n")
+        self.lines.extend(new_lines)
         logging.info(f"Overlay '{overlay}' enabled.")
 
     def remove_hifiberry_overlays(self):
         original_length = len(self.lines)
         # Remove HiFiBerry overlays, detection disabled comment, card comments, and force_eeprom_read
-        self.lines = [line for line in self.lines 
-                      if not line.strip().startswith("dtoverlay=hifiberry") 
-                      and line.strip() != HIFIBERRY_DETECTION_DISABLED
-                      and not line.strip().startswith("# HiFiBerry card:")
-                      and not line.strip().startswith("force_eeprom_read=")]
+        lines = []
+        for line in self.lines:
+            stripped = line.strip()
+            if not stripped.startswith(HIFIBERRY_LINE_PREFIXES) and stripped != HIFIBERRY_DETECTION_DISABLED:
+                lines.append(line)
+        self.lines = lines
         if len(self.lines) < original_length:
             logging.info("All HiFiBerry overlays and detection comment removed.")
 
@@ -239,13 +316,48 @@ class ConfigTxt:
         self._update_interface("spi", False)
 
     def default_config(self):
-        self.remove_hifiberry_overlays()
-        self.disable_onboard_sound()
-        self.disable_hdmi_sound()
-        self.enable_eeprom()
-        self.enable_spi()
-        self.enable_i2c()
-        self.disable_hat_i2c()
+        """Apply the default configuration in a single pass over the buffer.
+
+        Same result as calling remove_hifiberry_overlays(),
+        disable_onboard_sound(), disable_hdmi_sound(), enable_eeprom(),
+        enable_spi(), enable_i2c() and disable_hat_i2c() in that order.
+        """
+        pending = dict(DEFAULT_CONFIG_LINES)
+        prefixes = tuple(pending)
+        removed_overlays = False
+        removed_hat_i2c = False
+        lines = []
+        for line in self.lines:
+            stripped = line.strip()
+            if stripped.startswith(HIFIBERRY_LINE_PREFIXES) or stripped == HIFIBERRY_DETECTION_DISABLED:
+                removed_overlays = True
+                continue
+            if stripped == HAT_I2C_OVERLAY:
+                removed_hat_i2c = True
+                continue
+            if stripped.startswith("dtoverlay=vc4-kms-v3d"):
+                if ",noaudio" not in line:
+                    line = stripped + ",noaudio\n"
+            elif stripped.startswith(prefixes):
+                for prefix in prefixes:
+                    if prefix in pending and stripped.startswith(prefix):
+                        line = pending.pop(prefix)
+                        break
+            lines.append(line)
+        # force_eeprom_read= lines were all removed above, so it always ends
+        # up here, just like enable_eeprom() after remove_hifiberry_overlays()
+        lines.extend(pending.values())
+        self.lines = lines
+
+        if removed_overlays:
+            logging.info("All HiFiBerry overlays and detection comment removed.")
+        logging.info("Onboard sound disabled.")
+        logging.info("HDMI sound disabled.")
+        logging.info("EEPROM read enabled.")
+        logging.info("SPI interface set to on.")
+        logging.info("I2C_ARM interface set to on.")
+        if removed_hat_i2c:
+            logging.info("HAT I2C overlay disabled.")
         logging.info("Default configuration applied. I2C enabled.")
 
     def enable_updi(self):
@@ -255,9 +367,11 @@ class ConfigTxt:
         - dtoverlay=uart0
         - dtoverlay=disable-bt
         """
-        self._update_line("enable_uart=", "enable_uart=1\n")
-        self._update_line("dtoverlay=uart0", "dtoverlay=uart0\n")
-        self._update_line("dtoverlay=disable-bt", "dtoverlay=disable-bt\n")
+        self._update_lines({
+            "enable_uart=": "enable_uart=1\n",
+            "dtoverlay=uart0": "dtoverlay=uart0\n",
+            "dtoverlay=disable-bt": "dtoverlay=disable-bt\n",
+        })
         logging.info("UPDI settings applied. Reboot may be required.")
 
     def _dwc2_owner_section(self, version):
@@ -330,15 +444,14 @@ class ConfigTxt:
         logging.info("USB gadget mode disabled. Reboot required.")
 
     def enable_hat_i2c(self):
-        overlay_line = "dtoverlay=i2c-gpio,i2c_gpio_sda=0,i2c_gpio_scl=1\n"
         # Prevent duplicates if the line already exists
-        if not any(line.strip() == overlay_line.strip() for line in self.lines):
-            self.lines.append(overlay_line)
+        if not any(line.strip() == HAT_I2C_OVERLAY for line in self.lines):
+            self.lines.append(HAT_I2C_OVERLAY + "\n")
             logging.info("HAT I2C overlay enabled.")
 
     def disable_hat_i2c(self):
         original_length = len(self.lines)
-        self.lines = [line for line in self.lines if line.strip() != "dtoverlay=i2c-gpio,i2c_gpio_sda=0,i2c_gpio_scl=1"]
+        self.lines = [line for line in self.lines if line.strip() != HAT_I2C_OVERLAY]
         if len(self.lines) < original_length:
             logging.info("HAT I2C overlay disabled.")
 
@@ -357,7 +470,6 @@ class ConfigTxt:
             soundcard = Soundcard()
             if soundcard.name:
                 # Get the sound card definition from the soundcard module
-                from .soundcard import SOUND_CARD_DEFINITIONS
                 card_def = SOUND_CARD_DEFINITIONS.get(soundcard.name)
                 if card_def and card_def.get("dtoverlay"):
                     overlay = card_def["dtoverlay"]
@@ -375,6 +487,64 @@ class ConfigTxt:
             raise
 
 
+# Command line flag -> ConfigTxt method, in the order the changes are applied.
+# Flags that take a value (e.g. --overlay) pass it to the method.
+ACTIONS = [
+    ("default_config", "default_config"),
+    ("remove_hifiberry", "remove_hifiberry_overlays"),
+    ("overlay", "enable_overlay"),
+    ("autodetect_overlay", "autodetect_overlay"),
+    ("disable_onboard_sound", "disable_onboard_sound"),
+    ("enable_onboard_sound", "enable_onboard_sound"),
+    ("disable_hdmi_sound", "disable_hdmi_sound"),
+    ("enable_hdmi_sound", "enable_hdmi_sound"),
+    ("disable_eeprom", "disable_eeprom"),
+    ("enable_eeprom", "enable_eeprom"),
+    ("disable_i2c", "disable_i2c"),
+    ("enable_i2c", "enable_i2c"),
+    ("disable_spi", "disable_spi"),
+    ("enable_spi", "enable_spi"),
+    ("enable_updi", "enable_updi"),
+    ("enable_usb_gadget", "enable_usb_gadget"),
+    ("disable_usb_gadget", "disable_usb_gadget"),
+    ("enable_hat_i2c", "enable_hat_i2c"),
+    ("disable_hat_i2c", "disable_hat_i2c"),
+    ("enable_detection", "enable_detection"),
+    ("disable_detection", "disable_detection"),
+]
+
+
+def _apply_usb_gadget_psu_workaround():
+    """Set PSU_MAX_CURRENT=3000 in the bootloader EEPROM where needed.
+
+    Pi5/CM5 fail to enumerate on Apple hosts unless the PD request is
+    suppressed. See https://github.com/raspberrypi/linux/issues/6569
+
+    This step is independent of the config.txt change and must not be
+    allowed to discard it: a failure here (missing binary, busy/unreadable
+    EEPROM, etc.) is caught and logged as a warning rather than propagating,
+    so config.save() still runs.
+    """
+    from .booteeprom import needs_psu_workaround, set_psu_max_current
+
+    version = PiModel().get_version()
+    if needs_psu_workaround(version):
+        try:
+            if set_psu_max_current(3000):
+                logging.info(
+                    "Applied PSU_MAX_CURRENT=3000 (required for USB gadget on Apple hosts)."
+                )
+        except Exception as e:
+            logging.warning(
+                "Could not set PSU_MAX_CURRENT=3000 in the bootloader EEPROM "
+                f"({e}). The config.txt USB gadget change was still applied, "
+                "but on Pi5/CM5 the Mac will NOT enumerate the gadget until "
+                "PSU_MAX_CURRENT=3000 is set in the bootloader EEPROM -- set "
+                "it manually (e.g. `rpi-eeprom-config --edit`) or rerun this "
+                "command once rpi-eeprom-config is available."
+            )
+
+
 def main():
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -406,93 +576,17 @@ def main():
     config = ConfigTxt()
 
     try:
-        if args.default_config:
-            config.default_config()
-
-        if args.remove_hifiberry:
-            config.remove_hifiberry_overlays()
-
-        if args.overlay:
-            config.enable_overlay(args.overlay)
-
-        if args.autodetect_overlay:
-            config.autodetect_overlay()
-
-        if args.disable_onboard_sound:
-            config.disable_onboard_sound()
-
-        if args.enable_onboard_sound:
-            config.enable_onboard_sound()
-
-        if args.disable_hdmi_sound:
-            config.disable_hdmi_sound()
-
-        if args.enable_hdmi_sound:
-            config.enable_hdmi_sound()
-
-        if args.disable_eeprom:
-            config.disable_eeprom()
-
-        if args.enable_eeprom:
-            config.enable_eeprom()
-
-        if args.disable_i2c:
-            config.disable_i2c()
-
-        if args.enable_i2c:
-            config.enable_i2c()
-
-        if args.disable_spi:
-            config.disable_spi()
-
-        if args.enable_spi:
-            config.enable_spi()
-
-        if args.enable_updi:
-            config.enable_updi()
+        for attr, method in ACTIONS:
+            value = getattr(args, attr)
+            if not value:
+                continue
+            if value is True:
+                getattr(config, method)()
+            else:
+                getattr(config, method)(value)
 
         if args.enable_usb_gadget:
-            config.enable_usb_gadget()
-            # Pi5/CM5 fail to enumerate on Apple hosts unless the PD request is
-            # suppressed. See https://github.com/raspberrypi/linux/issues/6569
-            #
-            # This step is independent of the config.txt change above and must
-            # not be allowed to discard it: a failure here (missing binary,
-            # busy/unreadable EEPROM, etc.) is caught and logged as a warning
-            # rather than propagating, so config.save() below still runs.
-            from .booteeprom import needs_psu_workaround, set_psu_max_current
-
-            version = PiModel().get_version()
-            if needs_psu_workaround(version):
-                try:
-                    if set_psu_max_current(3000):
-                        logging.info(
-                            "Applied PSU_MAX_CURRENT=3000 (required for USB gadget on Apple hosts)."
-                        )
-                except Exception as e:
-                    logging.warning(
-                        "Could not set PSU_MAX_CURRENT=3000 in the bootloader EEPROM "
-                        f"({e}). The config.txt USB gadget change was still applied, "
-                        "but on Pi5/CM5 the Mac will NOT enumerate the gadget until "
-                        "PSU_MAX_CURRENT=3000 is set in the bootloader EEPROM -- set "
-                        "it manually (e.g. `rpi-eeprom-config --edit`) or rerun this "
-                        "command once rpi-eeprom-config is available."
-                    )
-
-        if args.disable_usb_gadget:
-            config.disable_usb_gadget()
-
-        if args.enable_hat_i2c:
-            config.enable_hat_i2c()
-
-        if args.disable_hat_i2c:
-            config.disable_hat_i2c()
-
-        if args.enable_detection:
-            config.enable_detection()
-
-        if args.disable_detection:
-            config.disable_detection()
+            _apply_usb_gadget_psu_workaround()
 
         config.save()
 
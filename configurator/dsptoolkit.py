@@ -6,21 +6,61 @@ Module for detecting and interacting with DSP (Digital Signal Processor) hardwar
 """
 
 import logging
+import threading
+import time
 import requests
 import json
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, Tuple
+
+from .handlers._util import decode_json
 
 # Default DSP service configuration
 DEFAULT_DSP_HOST = "localhost"
 DEFAULT_DSP_PORT = 13141
 DEFAULT_TIMEOUT = 5.0
 
+# Seconds a detect_dsp() result is reused. DSP presence only changes across
+# reboots, this just collapses back-to-back queries into one request.
+DETECT_CACHE_TTL = 2.0
+
+# (host, port) -> (monotonic timestamp, detect_dsp() result), shared by all
+# DSPToolkit instances so the convenience functions benefit as well
+_detect_cache: Dict[Tuple[str, int], Tuple[float, Optional[Dict[str, Any]]]] = {}
+
+# Retry once on a failed connect or a gateway error, e.g. while the DSP
+# service is still starting. The last response is returned rather than
+# raised so error statuses are reported the same way as without a retry.
+DSP_RETRY = Retry(total=1, connect=1, backoff_factor=0.05,
+                  status_forcelist=[502, 503, 504], raise_on_status=False)
+
+# HTTP session shared by all DSPToolkit instances, so repeated queries reuse
+# the keep-alive connection to the DSP service instead of reconnecting
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=DSP_RETRY)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
 class DSPToolkit:
     """
     Toolkit for DSP hardware detection and interaction
     """
     
-    def __init__(self, host: str = DEFAULT_DSP_HOST, port: int = DEFAULT_DSP_PORT, timeout: float = DEFAULT_TIMEOUT):
+    def __init__(self, host: str = DEFAULT_DSP_HOST, port: int = DEFAULT_DSP_PORT, timeout: float = DEFAULT_TIMEOUT,
+                 cache_ttl: float = DETECT_CACHE_TTL):
         """
         Initialize DSP toolkit
         
@@ -28,27 +68,51 @@ class DSPToolkit:
             host: DSP service hostname (default: localhost)
             port: DSP service port (default: 13141)
             timeout: Request timeout in seconds (default: 5.0)
+            cache_ttl: Seconds a detection result is reused, 0 disables caching (default: 2.0)
         """
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.cache_ttl = cache_ttl
         self.base_url = f"http://{host}:{port}"
-    
+
+    def invalidate(self) -> None:
+        """
+        Forget the cached detection result so the next query asks the DSP service
+        """
+        _detect_cache.pop((self.host, self.port), None)
+
     def detect_dsp(self) -> Optional[Dict[str, Any]]:
         """
         Detect DSP hardware by querying the DSP service
+
+        Results are reused for cache_ttl seconds.
         
         Returns:
             Dictionary with DSP detection information, or None if detection fails
             Expected format: {"detected_dsp": "ADAU14xx", "status": "detected"}
         """
+        key = (self.host, self.port)
+        cached = _detect_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self.cache_ttl:
+            return cached[1]
+
+        dsp_info = self._query_dsp()
+        _detect_cache[key] = (now, dsp_info)
+        return dsp_info
+
+    def _query_dsp(self) -> Optional[Dict[str, Any]]:
+        """
+        Query the DSP service for the detected DSP, bypassing the cache
+        """
         try:
             url = f"{self.base_url}/hardware/dsp"
-            response = requests.get(url, timeout=self.timeout)
+            response = _get_session().get(url, timeout=self.timeout)
             
             if response.status_code == 200:
                 try:
-                    dsp_info = response.json()
+                    dsp_info = decode_json(response.content)
                     logging.debug(f"DSP detection response: {dsp_info}")
                     return dsp_info
                 except json.JSONDecodeError as e:
@@ -180,9 +244,16 @@ def main():
     # Create DSP toolkit instance
     toolkit = DSPToolkit(args.host, args.port, args.timeout)
     
+    # Query the DSP service once; every output mode is derived from this
+    dsp_info = toolkit.detect_dsp()
+    if dsp_info is None:
+        status = "unavailable"
+    else:
+        status = dsp_info.get("status", "error")
+
     # Handle different output modes
     if args.name_only:
-        dsp_name = toolkit.get_detected_dsp_name()
+        dsp_name = dsp_info.get("detected_dsp") if status == "detected" else None
         if dsp_name:
             print(dsp_name)
             sys.exit(0)
@@ -190,12 +261,10 @@ def main():
             sys.exit(1)
     
     elif args.status_only:
-        status = toolkit.get_dsp_status()
         print(status)
         sys.exit(0 if status == "detected" else 1)
     
     elif args.json:
-        dsp_info = toolkit.detect_dsp()
         if dsp_info:
             print(json.dumps(dsp_info, indent=2))
             sys.exit(0)
@@ -205,7 +274,6 @@ def main():
     
     else:
         # Default human-readable output
-        dsp_info = toolkit.detect_dsp()
         if dsp_info:
             status = dsp_info.get("status", "unknown")
             if status == "detected":
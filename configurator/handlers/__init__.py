@@ -2,25 +2,44 @@
 API Handlers Package
 
 Contains all API endpoint handlers for the HiFiBerry Configurator.
+
+Handlers are imported on first access (PEP 562), so importing the package
+or a single handler module doesn't pull in Flask, D-Bus and the other
+dependencies of every handler.
 """
 
-try:
-    from .systemd_handler import SystemdHandler
-    from .smb_handler import SMBHandler
-    from .hostname_handler import HostnameHandler
-    from .soundcard_handler import SoundcardHandler
-    from .system_handler import SystemHandler
-    from .filesystem_handler import FilesystemHandler
-    from .script_handler import ScriptHandler
-    from .network_handler import NetworkHandler
-    from .i2c_handler import I2CHandler
-    from .volume_handler import VolumeHandler
-    from .bluetooth_handler import BluetoothHandler
-    from .player_registry_handler import PlayerRegistryHandler
-    from .ble_handler import BLEProvisioningHandler
-    from .extensions_handler import ExtensionsHandler
-
-    __all__ = ['SystemdHandler', 'SMBHandler', 'HostnameHandler', 'SoundcardHandler', 'SystemHandler', 'FilesystemHandler', 'ScriptHandler', 'NetworkHandler', 'I2CHandler', 'VolumeHandler', 'BluetoothHandler', 'PlayerRegistryHandler', 'BLEProvisioningHandler', 'ExtensionsHandler']
-except ImportError:
-    # Flask not available - likely during testing or installation
-    __all__ = []
+from importlib import import_module
+
+# Handler class name -> module defining it
+_HANDLER_MODULES = {
+    'SystemdHandler': '.systemd_handler',
+    'SMBHandler': '.smb_handler',
+    'HostnameHandler': '.hostname_handler',
+    'SoundcardHandler': '.soundcard_handler',
+    'SystemHandler': '.system_handler',
+    'FilesystemHandler': '.filesystem_handler',
+    'ScriptHandler': '.script_handler',
+    'NetworkHandler': '.network_handler',
+    'I2CHandler': '.i2c_handler',
+    'VolumeHandler': '.volume_handler',
+    'BluetoothHandler': '.bluetooth_handler',
+    'PlayerRegistryHandler': '.player_registry_handler',
+    'BLEProvisioningHandler': '.ble_handler',
+    'ExtensionsHandler': '.extensions_handler',
+}
+
+__all__ = list(_HANDLER_MODULES)
+
+
+def __getattr__(name):
+    module = _HANDLER_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    handler = getattr(import_module(module, __name__), name)
+    # Cache it so later lookups don't go through __getattr__ again
+    globals()[name] = handler
+    return handler
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the API handlers
+"""
+
+import functools
+import hashlib
+import json
+import logging
+from typing import Any, Optional, Union
+
+try:
+    from flask import Response, request
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    # Flask not available - likely during testing or installation
+    Response = None
+    request = None
+    DefaultJSONProvider = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_json(payload: Any) -> bytes:
+    """
+    Serialize payload the way jsonify does outside debug mode (compact,
+    sorted keys), using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()
+
+
+def decode_json(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON text, using orjson when it is installed. Invalid input raises
+    json.JSONDecodeError, which orjson's decode error subclasses.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_response(payload: Union[Any, bytes], status: int = 200) -> Response:
+    """
+    Build a JSON response.
+
+    Args:
+        payload: Data to serialize, or a body already encoded with encode_json()
+        status: HTTP status code (default: 200)
+    """
+    body = payload if isinstance(payload, bytes) else encode_json(payload)
+    return Response(body, status=status, mimetype='application/json')
+
+
+def error_body(message: str, exc: Optional[BaseException] = None) -> bytes:
+    """
+    Encode the standard error document, {'status': 'error', 'message': ...},
+    with the exception text as 'error' if exc is given.
+    """
+    payload = {'status': 'error', 'message': message}
+    if exc is not None:
+        payload['error'] = str(exc)
+    return encode_json(payload)
+
+
+def error_response(message: str, exc: Optional[BaseException] = None, status: int = 500) -> Response:
+    """
+    Build a standard error response.
+
+    Args:
+        message: Human readable error message
+        exc: Exception whose text is reported as 'error' (default: None)
+        status: HTTP status code (default: 500)
+    """
+    return Response(error_body(message, exc), status=status, mimetype='application/json')
+
+
+def handle_errors(message: str):
+    """
+    Decorator for handler methods: an exception escaping the method is
+    logged to the method's module logger and answered with
+    error_response(message, exc).
+
+    Args:
+        message: Error message reported to the client
+    """
+    def decorator(method):
+        logger = logging.getLogger(method.__module__)
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                logger.error("%s: %s", message, e)
+                logger.debug("Traceback:", exc_info=True)
+                return error_response(message, e)
+        return wrapper
+    return decorator
+
+
+def conditional_json_response(body: bytes) -> Response:
+    """
+    Build a JSON response carrying an ETag derived from the body.
+
+    If the request's If-None-Match already names that ETag, an empty
+    304 Not Modified response is returned instead, so polling clients
+    don't receive unchanged data again.
+
+    Args:
+        body: Response body encoded with encode_json()
+    """
+    response = Response(body, mimetype='application/json')
+    response.set_etag(hashlib.blake2b(body, digest_size=8).hexdigest(), weak=True)
+    return response.make_conditional(request)
+
+
+if DefaultJSONProvider is not None and orjson is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """
+        JSON provider parsing request bodies with orjson.
+
+        Only loads() is replaced; responses are still produced by the default
+        provider so jsonify() output doesn't change. orjson.JSONDecodeError
+        subclasses ValueError, which is what Flask handles for bad bodies.
+        """
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+else:
+    ORJSONProvider = None
@@ -1,4 +1,5 @@
 import logging
+import threading
 from flask import jsonify, request
 from ..bluetooth import get_bluetooth_settings, set_bluetooth_settings, get_paired_devices, unpair_device
 
@@ -6,18 +7,19 @@ logger = logging.getLogger(__name__)
 
 class BluetoothHandler:
     """Handler for bluetooth configuration API endpoints"""
-    passkey=None
-    show_modal=None
 
     def __init__(self):
         """Initialize the bluetooth handler"""
-        self.passkey = None
-        pass
+        # Requests are served from several threads; the lock makes each
+        # read-and-clear below atomic so a value is handed out only once
+        self._lock = threading.Lock()
+        self._passkey = None
+        self._show_modal = None
 
     def handle_get_bluetooth_passkey(self):
         """Return the stored passkey and delete it afterwards."""
-        value = self.passkey
-        self.passkey = None
+        with self._lock:
+            value, self._passkey = self._passkey, None
         return jsonify({
             'status': 'success',
             'passkey': value
@@ -34,7 +36,8 @@ class BluetoothHandler:
                     'message': 'No passkey provided'
                 }), 400
 
-            self.passkey = pk
+            with self._lock:
+                self._passkey = pk
 
             return jsonify({
                 'status': 'success',
@@ -60,7 +63,8 @@ class BluetoothHandler:
                     'message': 'No modal value provided'
                 }), 400
 
-            self.show_modal = modal
+            with self._lock:
+                self._show_modal = modal
 
             return jsonify({
                 'status': 'success',
@@ -77,8 +81,8 @@ class BluetoothHandler:
 
     def handle_get_show_modal(self):
         """Return the stored modal request and clear it."""
-        value = self.show_modal
-        self.show_modal = None
+        with self._lock:
+            value, self._show_modal = self._show_modal, None
         return jsonify({
             'status': 'success',
             'modal': value
@@ -2,14 +2,45 @@
 
 import logging
 import os
-import json
-import subprocess
-from flask import jsonify, request
+from flask import Response, request
 from typing import Dict, List, Any, Optional
-import traceback
+
+from ._util import encode_json, error_body, json_response
+from ..config_parser import ConfigParser
 
 logger = logging.getLogger(__name__)
 
+# Bodies of constant error responses, encoded once
+_ERR_NOT_JSON = error_body('Content-Type must be application/json')
+_ERR_MISSING_BODY = error_body('Missing request body')
+_ERR_MISSING_DIRECTORY = error_body('Missing required field: directory')
+_ERR_MISSING_PATH = error_body('Missing required field: path')
+_ERR_DIRECTORY_ACCESS_NOT_ALLOWED = encode_json({
+    'status': 'error',
+    'message': 'Directory access is not allowed - no destinations configured',
+    'error': 'directory_access_not_allowed'
+})
+_ERR_FILE_ACCESS_NOT_ALLOWED = encode_json({
+    'status': 'error',
+    'message': 'File access is not allowed - no destinations configured',
+    'error': 'file_access_not_allowed'
+})
+
+def _stream_symlinks(directory: str, symlinks: List[Dict[str, Any]]):
+    """
+    Yield the symlink listing response one record at a time.
+
+    Produces the same document as json_response() would, but without building
+    the whole JSON text in memory for directories with many symlinks.
+    """
+    yield b'{"data":{"count":%d,"directory":%s,"symlinks":[' % (len(symlinks), encode_json(directory))
+    separator = b''
+    for symlink in symlinks:
+        yield separator + encode_json(symlink)
+        separator = b','
+    yield b']},"message":"Symlinks listed successfully","status":"success"}'
+
+
 class FilesystemHandler:
     """Handler for filesystem related API endpoints"""
     
@@ -22,14 +53,12 @@ class FilesystemHandler:
     def _load_config(self) -> None:
         """Load configuration from config file"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    filesystem_config = config.get('filesystem', {})
-                    self.allowed_symlink_destinations = filesystem_config.get('allowed_symlink_destinations', [])
-                    self.allowed_exists_check_destinations = filesystem_config.get('allowed_exists_check_destinations', ['/etc'])
-                    logger.debug(f"Loaded allowed symlink destinations: {self.allowed_symlink_destinations}")
-                    logger.debug(f"Loaded allowed exists check destinations: {self.allowed_exists_check_destinations}")
+            filesystem_config = self._read_filesystem_config()
+            if filesystem_config is not None:
+                self.allowed_symlink_destinations = filesystem_config.get('allowed_symlink_destinations', [])
+                self.allowed_exists_check_destinations = filesystem_config.get('allowed_exists_check_destinations', ['/etc'])
+                logger.debug(f"Loaded allowed symlink destinations: {self.allowed_symlink_destinations}")
+                logger.debug(f"Loaded allowed exists check destinations: {self.allowed_exists_check_destinations}")
             else:
                 logger.warning(f"Config file {self.config_file} not found, no symlink destinations allowed")
                 self.allowed_symlink_destinations = []
@@ -38,7 +67,31 @@ class FilesystemHandler:
             logger.error(f"Error loading config: {e}")
             self.allowed_symlink_destinations = []
             self.allowed_exists_check_destinations = ['/etc']
+
+        # Directory and prefix tuples for a single str.startswith() check.
+        # Prefixes end with a separator so /data/music doesn't also allow
+        # /data/music-private. Symlink destinations are resolved so they can
+        # be compared against the resolved requested directory or path.
+        self._allowed_symlink_dirs = tuple(
+            os.path.realpath(dest) for dest in self.allowed_symlink_destinations
+        )
+        self._allowed_symlink_prefixes = tuple(
+            os.path.join(dest, '') for dest in self._allowed_symlink_dirs
+        )
+        self._allowed_exists_check_dirs = tuple(
+            os.path.realpath(dest) for dest in self.allowed_exists_check_destinations
+        )
+        self._allowed_exists_check_prefixes = tuple(
+            os.path.join(dest, '') for dest in self._allowed_exists_check_dirs
+        )
     
+    def _read_filesystem_config(self) -> Optional[Dict[str, Any]]:
+        """Return the config file's "filesystem" section, or None if the file is missing"""
+        if not os.path.exists(self.config_file):
+            return None
+        # ConfigParser caches the parsed file until it changes on disk
+        return ConfigParser(self.config_file).load_config().get('filesystem', {})
+
     def handle_list_symlinks(self) -> Dict[str, Any]:
         """
         Handle POST /api/v1/filesystem/symlinks
@@ -47,43 +100,27 @@ class FilesystemHandler:
         try:
             # Get JSON data from request
             if not request.is_json:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Content-Type must be application/json'
-                }), 400
+                return json_response(_ERR_NOT_JSON, 400)
             
             data = request.get_json()
             if not data:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Missing request body'
-                }), 400
+                return json_response(_ERR_MISSING_BODY, 400)
             
             # Validate required fields
             directory = data.get('directory')
             if not directory:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Missing required field: directory'
-                }), 400
+                return json_response(_ERR_MISSING_DIRECTORY, 400)
             
             # Check if directory access is allowed
             if not self.allowed_symlink_destinations:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Directory access is not allowed - no destinations configured',
-                    'error': 'directory_access_not_allowed'
-                }), 403
-            
-            # Validate directory is in allowed list
-            directory_allowed = False
-            for allowed_dest in self.allowed_symlink_destinations:
-                if directory.startswith(allowed_dest):
-                    directory_allowed = True
-                    break
+                return json_response(_ERR_DIRECTORY_ACCESS_NOT_ALLOWED, 403)
             
-            if not directory_allowed:
-                return jsonify({
+            # Validate directory is in allowed list. The resolved path is
+            # checked so "..", or a symlink in the path, can't escape it.
+            resolved = os.path.realpath(directory)
+            if (resolved not in self._allowed_symlink_dirs
+                    and not resolved.startswith(self._allowed_symlink_prefixes)):
+                return json_response({
                     'status': 'error',
                     'message': 'Directory is not in allowed destinations',
                     'error': 'directory_not_allowed',
@@ -91,49 +128,59 @@ class FilesystemHandler:
                         'directory': directory,
                         'allowed_destinations': self.allowed_symlink_destinations
                     }
-                }), 403
+                }, 403)
             
             # Validate path exists and is a directory
             if not os.path.exists(directory):
-                return jsonify({
+                return json_response({
                     'status': 'error',
                     'message': 'Directory does not exist',
                     'data': {
                         'directory': directory
                     }
-                }), 404
+                }, 404)
             
             if not os.path.isdir(directory):
-                return jsonify({
+                return json_response({
                     'status': 'error',
                     'message': 'Path is not a directory',
                     'data': {
                         'directory': directory
                     }
-                }), 400
+                }, 400)
             
             # Get symlinks
             try:
                 symlinks = []
-                for item in os.listdir(directory):
-                    item_path = os.path.join(directory, item)
-                    if os.path.islink(item_path):
+                # scandir hands back the entry type from the directory read,
+                # so only symlinks cost extra syscalls
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if not entry.is_symlink():
+                            continue
+                        item = entry.name
+                        item_path = entry.path
                         try:
                             # Get symlink target
                             target = os.readlink(item_path)
                             
-                            # Check if target exists
-                            target_exists = os.path.exists(item_path)  # This follows the symlink
+                            # Check if target exists (stat follows the symlink)
+                            try:
+                                os.stat(item_path)
+                                target_exists = True
+                            except OSError:
+                                target_exists = False
                             
-                            # Get absolute target path
-                            if not os.path.isabs(target):
-                                abs_target = os.path.abspath(os.path.join(directory, target))
-                            else:
+                            # Get absolute target path (same test as
+                            # os.path.isabs, without the function call)
+                            if target.startswith('/'):
                                 abs_target = target
+                            else:
+                                abs_target = os.path.abspath(os.path.join(directory, target))
                             
                             # Get symlink info
                             try:
-                                stat_info = os.lstat(item_path)  # lstat doesn't follow symlinks
+                                stat_info = entry.stat(follow_symlinks=False)
                                 symlinks.append({
                                     'name': item,
                                     'path': item_path,
@@ -164,33 +211,25 @@ class FilesystemHandler:
                 # Sort symlinks by name
                 symlinks.sort(key=lambda x: x['name'].lower())
                 
-                return jsonify({
-                    'status': 'success',
-                    'message': 'Symlinks listed successfully',
-                    'data': {
-                        'directory': directory,
-                        'symlinks': symlinks,
-                        'count': len(symlinks)
-                    }
-                })
+                return Response(_stream_symlinks(directory, symlinks), mimetype='application/json')
                 
             except PermissionError:
-                return jsonify({
+                return json_response({
                     'status': 'error',
                     'message': 'Permission denied accessing directory',
                     'data': {
                         'directory': directory
                     }
-                }), 403
+                }, 403)
                 
         except Exception as e:
             logger.error(f"Error listing symlinks: {e}")
-            logger.debug(traceback.format_exc())
-            return jsonify({
+            logger.debug("Traceback:", exc_info=True)
+            return json_response({
                 'status': 'error',
                 'message': 'Failed to list symlinks',
                 'error': str(e)
-            }), 500
+            }, 500)
     
     def handle_file_exists(self) -> Dict[str, Any]:
         """
@@ -200,43 +239,27 @@ class FilesystemHandler:
         try:
             # Get JSON data from request
             if not request.is_json:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Content-Type must be application/json'
-                }), 400
+                return json_response(_ERR_NOT_JSON, 400)
             
             data = request.get_json()
             if not data:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Missing request body'
-                }), 400
+                return json_response(_ERR_MISSING_BODY, 400)
             
             # Validate required fields
             path = data.get('path')
             if not path:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Missing required field: path'
-                }), 400
+                return json_response(_ERR_MISSING_PATH, 400)
             
             # Check if directory access is allowed
             if not self.allowed_exists_check_destinations:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'File access is not allowed - no destinations configured',
-                    'error': 'file_access_not_allowed'
-                }), 403
-            
-            # Validate path is in allowed list
-            path_allowed = False
-            for allowed_dest in self.allowed_exists_check_destinations:
-                if path.startswith(allowed_dest):
-                    path_allowed = True
-                    break
+                return json_response(_ERR_FILE_ACCESS_NOT_ALLOWED, 403)
             
-            if not path_allowed:
-                return jsonify({
+            # Validate path is in allowed list. Like for symlink listings the
+            # resolved path is checked, so ".." or a symlink can't escape it.
+            resolved = os.path.realpath(path)
+            if (resolved not in self._allowed_exists_check_dirs
+                    and not resolved.startswith(self._allowed_exists_check_prefixes)):
+                return json_response({
                     'status': 'error',
                     'message': 'Path is not in allowed destinations',
                     'error': 'path_not_allowed',
@@ -244,12 +267,12 @@ class FilesystemHandler:
                         'path': path,
                         'allowed_destinations': self.allowed_exists_check_destinations
                     }
-                }), 403
+                }, 403)
             
             # Check if path exists
-            exists = os.path.exists(path)
+            exists = os.path.exists(resolved)
             
-            return jsonify({
+            return json_response({
                 'status': 'success',
                 'message': f"File {'exists' if exists else 'does not exist'}",
                 'data': {
@@ -259,9 +282,9 @@ class FilesystemHandler:
             
         except Exception as e:
             logger.error(f"Error checking file existence: {e}")
-            logger.debug(traceback.format_exc())
-            return jsonify({
+            logger.debug("Traceback:", exc_info=True)
+            return json_response({
                 'status': 'error',
                 'message': 'Failed to check file existence',
                 'error': str(e)
-            }), 500
+            }, 500)
@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 
 import logging
-from typing import Dict, Any
-import traceback
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
 
 try:
-    from flask import jsonify, request
+    from flask import request
 except ImportError:
     # Flask not available - likely during testing or installation
-    jsonify = None
     request = None
 
 from ..hostname_utils import (
@@ -19,16 +19,86 @@ from ..hostname_utils import (
     set_pretty_hostname
 )
 from ..hostconfig import set_hostname_with_hosts_update
+from ._util import conditional_json_response, encode_json, error_body, error_response, json_response
 
 logger = logging.getLogger(__name__)
 
+# Bodies of constant error responses, encoded once
+_ERR_NOT_JSON = error_body('Content-Type must be application/json')
+_ERR_MISSING_BODY = error_body('Missing request body')
+_ERR_BODY_TOO_LARGE = error_body('Request body too large')
+_ERR_NOT_OBJECT = error_body('Request body must be a JSON object')
+_ERR_LOOKUP_FAILED = error_body('Failed to retrieve hostname information')
+_ERR_NO_HOSTNAME = error_body('Must provide either hostname or pretty_hostname')
+_ERR_INVALID_PRETTY = error_body('Invalid pretty hostname format')
+_ERR_INVALID_HOSTNAME = error_body('Invalid hostname format (max 64 chars, ASCII letters/numbers/hyphens, no leading/trailing hyphens)')
+_ERR_UPDATE_FAILED = error_body('Failed to update hostname')
+
+# Largest request body accepted by handle_set_hostname. Valid requests are
+# well below 1 KiB, so larger ones are rejected before they are read.
+MAX_BODY_SIZE = 4096
+
+# Seconds a hostname lookup is reused. Reading the hostnames runs hostnamectl
+# twice, while they only change through handle_set_hostname (which updates
+# or drops the cache) or an administrator.
+HOSTNAME_CACHE_TTL = 5.0
+
+# (monotonic timestamp, (hostname, pretty_hostname)) of the last lookup
+_hostname_cache = None
+_hostname_cache_lock = threading.Lock()
+
+# (hostnames, encoded GET response body) of the last successful GET
+_hostname_body = None
+
+
+def _get_hostnames() -> Tuple[Optional[str], Optional[str]]:
+    """Return (hostname, pretty_hostname), reusing a lookup younger than HOSTNAME_CACHE_TTL"""
+    global _hostname_cache
+    # Held during the lookup so concurrent requests share a single one
+    with _hostname_cache_lock:
+        if _hostname_cache is not None and time.monotonic() - _hostname_cache[0] < HOSTNAME_CACHE_TTL:
+            return _hostname_cache[1]
+        hostnames = get_hostnames_with_fallback()
+        # Failed lookups aren't cached so the next request tries again
+        _hostname_cache = (time.monotonic(), hostnames) if hostnames[0] is not None else None
+        return hostnames
+
+
+def _store_hostnames(hostnames: Tuple[Optional[str], Optional[str]]) -> None:
+    """Replace the cached hostnames after they were changed"""
+    global _hostname_cache
+    with _hostname_cache_lock:
+        _hostname_cache = (time.monotonic(), hostnames) if hostnames[0] is not None else None
+
+
+def _invalidate_hostnames() -> None:
+    """Drop the cached hostnames so the next lookup asks hostnamectl"""
+    global _hostname_cache
+    with _hostname_cache_lock:
+        _hostname_cache = None
+
+
+def _get_hostname_body(hostnames: Tuple[str, Optional[str]]) -> bytes:
+    """Return the encoded GET response for hostnames, reusing the last one if unchanged"""
+    global _hostname_body
+    cached = _hostname_body
+    if cached is not None and cached[0] == hostnames:
+        return cached[1]
+    body = encode_json({
+        'status': 'success',
+        'data': {
+            'hostname': hostnames[0],
+            'pretty_hostname': hostnames[1]
+        }
+    })
+    # Replaced as a whole, so concurrent readers always see a matching pair
+    _hostname_body = (hostnames, body)
+    return body
+
+
 class HostnameHandler:
     """Handler for hostname related API endpoints"""
     
-    def __init__(self):
-        """Initialize the hostname handler"""
-        logger.debug("Initializing HostnameHandler")
-    
     def handle_get_hostname(self) -> Dict[str, Any]:
         """
         Handle GET /api/v1/hostname
@@ -37,30 +107,17 @@ class HostnameHandler:
         try:
             logger.debug("Getting current hostnames")
             
-            hostname, pretty_hostname = get_hostnames_with_fallback()
+            hostnames = _get_hostnames()
             
-            if hostname is None:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Failed to retrieve hostname information'
-                }), 500
+            if hostnames[0] is None:
+                return json_response(_ERR_LOOKUP_FAILED, 500)
             
-            return jsonify({
-                'status': 'success',
-                'data': {
-                    'hostname': hostname,
-                    'pretty_hostname': pretty_hostname
-                }
-            })
+            return conditional_json_response(_get_hostname_body(hostnames))
             
         except Exception as e:
-            logger.error(f"Error getting hostname: {e}")
-            logger.debug(traceback.format_exc())
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to get hostname',
-                'error': str(e)
-            }), 500
+            logger.error("Error getting hostname: %s", e)
+            logger.debug("Traceback:", exc_info=True)
+            return error_response('Failed to get hostname', e)
     
     def handle_set_hostname(self) -> Dict[str, Any]:
         """
@@ -68,37 +125,38 @@ class HostnameHandler:
         Set system hostname (and optionally pretty hostname)
         """
         try:
-            # Get JSON data from request
-            if not request.is_json:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Content-Type must be application/json'
-                }), 400
+            content_length = request.content_length
+            if content_length is not None and content_length > MAX_BODY_SIZE:
+                return json_response(_ERR_BODY_TOO_LARGE, 413)
+            
+            # Check the Content-Type. The plain prefix test accepts what
+            # clients send in practice without parsing the header; is_json
+            # only runs for anything else (e.g. "application/x+json").
+            if (not request.environ.get('CONTENT_TYPE', '').startswith('application/json')
+                    and not request.is_json):
+                return json_response(_ERR_NOT_JSON, 400)
             
-            data = request.get_json()
+            # force=True since the Content-Type is already known to be JSON;
+            # silent=True returns None for an empty or unparsable body
+            data = request.get_json(force=True, silent=True)
+            if data is None and not request.get_data(cache=True):
+                return json_response(_ERR_MISSING_BODY, 400)
+            if not isinstance(data, dict):
+                return json_response(_ERR_NOT_OBJECT, 400)
             if not data:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Missing request body'
-                }), 400
+                return json_response(_ERR_MISSING_BODY, 400)
             
             hostname = data.get('hostname')
             pretty_hostname = data.get('pretty_hostname')
             
             # Must provide at least one
             if not hostname and not pretty_hostname:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Must provide either hostname or pretty_hostname'
-                }), 400
+                return json_response(_ERR_NO_HOSTNAME, 400)
             
             # If pretty hostname provided, derive regular hostname from it
             if pretty_hostname:
                 if not validate_pretty_hostname(pretty_hostname):
-                    return jsonify({
-                        'status': 'error',
-                        'message': 'Invalid pretty hostname format'
-                    }), 400
+                    return json_response(_ERR_INVALID_PRETTY, 400)
                 
                 # Derive hostname from pretty hostname if not explicitly provided
                 if not hostname:
@@ -106,29 +164,37 @@ class HostnameHandler:
             
             # Validate hostname
             if hostname and not validate_hostname(hostname):
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Invalid hostname format (max 64 chars, ASCII letters/numbers/hyphens, no leading/trailing hyphens)'
-                }), 400
+                return json_response(_ERR_INVALID_HOSTNAME, 400)
             
-            logger.debug(f"Setting hostnames - hostname: {hostname}, pretty: {pretty_hostname}")
+            logger.debug("Setting hostnames - hostname: %s, pretty: %s", hostname, pretty_hostname)
             
             # Set the hostnames
             success = True
             
-            if hostname:
-                if not set_hostname_with_hosts_update(hostname):
-                    success = False
-            
-            if pretty_hostname and success:
-                if not set_pretty_hostname(pretty_hostname):
-                    success = False
+            try:
+                if hostname:
+                    if not set_hostname_with_hosts_update(hostname):
+                        success = False
+                
+                if pretty_hostname and success:
+                    if not set_pretty_hostname(pretty_hostname):
+                        success = False
+            except Exception:
+                # A write may have gone through before the failure
+                _invalidate_hostnames()
+                raise
             
             if success:
-                # Get updated hostnames to return
-                new_hostname, new_pretty = get_hostnames_with_fallback()
+                if pretty_hostname:
+                    # Both names were just written, no need to ask hostnamectl
+                    new_hostname, new_pretty = hostname, pretty_hostname
+                else:
+                    # "hostnamectl set-hostname" may change the pretty hostname
+                    # as well, so read back what it ended up as
+                    new_hostname, new_pretty = get_hostnames_with_fallback()
+                _store_hostnames((new_hostname, new_pretty))
                 
-                return jsonify({
+                return json_response({
                     'status': 'success',
                     'message': 'Hostname updated successfully',
                     'data': {
@@ -137,16 +203,12 @@ class HostnameHandler:
                     }
                 })
             else:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Failed to update hostname'
-                }), 500
+                # The hostname may have changed even if the pretty hostname
+                # couldn't be set, so don't serve the old names from the cache
+                _invalidate_hostnames()
+                return json_response(_ERR_UPDATE_FAILED, 500)
                 
         except Exception as e:
-            logger.error(f"Error setting hostname: {e}")
-            logger.debug(traceback.format_exc())
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to set hostname',
-                'error': str(e)
-            }), 500
+            logger.error("Error setting hostname: %s", e)
+            logger.debug("Traceback:", exc_info=True)
+            return error_response('Failed to set hostname', e)
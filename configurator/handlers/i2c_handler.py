@@ -1,12 +1,60 @@
 #!/usr/bin/env python3
 
 import logging
-from flask import jsonify, request
-from typing import Dict, Any
-from ..i2c import get_i2c_info
+import threading
+import time
+from flask import request
+from typing import Dict, Any, Optional, Tuple
+from ..i2c import get_i2c_info, FIRST_ADDRESS, LAST_ADDRESS
+from ._util import encode_json, error_body, error_response, json_response
 
 logger = logging.getLogger(__name__)
 
+# Bus numbers accepted by the scan endpoint
+VALID_BUSES = frozenset(range(11))
+
+# Bodies of constant error responses, encoded once
+_ERR_INVALID_BUS = error_body('Invalid bus number. Must be between 0 and 10.')
+_ERR_INVALID_ADDRESS = error_body(f'Invalid address. Must be between 0x{FIRST_ADDRESS:02x} and 0x{LAST_ADDRESS:02x}.')
+
+# Seconds a scan result is reused. A full scan is over a hundred bus
+# transactions, and dashboards poll this endpoint.
+I2C_CACHE_TTL = 2.0
+
+# (bus number, address or None) -> (monotonic timestamp, encoded response body)
+_scan_cache: Dict[Tuple[int, Optional[int]], Tuple[float, bytes]] = {}
+# Bus number -> lock held while that bus is scanned, so concurrent requests
+# wait for and reuse one scan instead of racing on the same /dev/i2c-N.
+# Different buses can be scanned in parallel.
+_bus_locks: Dict[int, threading.Lock] = {}
+_bus_locks_lock = threading.Lock()
+
+
+def _bus_lock(bus_number: int) -> threading.Lock:
+    """Return the scan lock of a bus, creating it on first use"""
+    with _bus_locks_lock:
+        lock = _bus_locks.get(bus_number)
+        if lock is None:
+            lock = _bus_locks[bus_number] = threading.Lock()
+        return lock
+
+
+def _scan_body(bus_number: int, address: Optional[int]) -> bytes:
+    """Return the encoded scan response, scanning only if no recent result exists"""
+    key = (bus_number, address)
+    with _bus_lock(bus_number):
+        # Checked under the lock: a scan that just finished is reused
+        cached = _scan_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < I2C_CACHE_TTL:
+            return cached[1]
+        i2c_info = get_i2c_info(bus_number, address)
+        body = encode_json({
+            'status': 'success' if 'error' not in i2c_info else 'error',
+            'data': i2c_info
+        })
+        _scan_cache[key] = (time.monotonic(), body)
+        return body
+
 
 class I2CHandler:
     """Handler for I2C device scanning API endpoints"""
@@ -27,21 +75,20 @@ class I2CHandler:
             bus_number = request.args.get('bus', default=1, type=int)
             
             # Validate bus number
-            if bus_number < 0 or bus_number > 10:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Invalid bus number. Must be between 0 and 10.'
-                }), 400
+            if bus_number not in VALID_BUSES:
+                return json_response(_ERR_INVALID_BUS, 400)
             
-            i2c_info = get_i2c_info(bus_number)
-            return jsonify({
-                'status': 'success' if 'error' not in i2c_info else 'error',
-                'data': i2c_info
-            })
+            # Optional single address to probe instead of scanning the bus
+            address = request.args.get('address')
+            if address is not None:
+                try:
+                    address = int(address, 0)
+                except ValueError:
+                    address = -1
+                if not FIRST_ADDRESS <= address <= LAST_ADDRESS:
+                    return json_response(_ERR_INVALID_ADDRESS, 400)
+
+            return json_response(_scan_body(bus_number, address))
         except Exception as e:
-            logger.error(f"Error scanning I2C devices: {e}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to scan I2C devices',
-                'error': str(e)
-            }), 500
+            logger.error("Error scanning I2C devices: %s", e)
+            return error_response('Failed to scan I2C devices', e)
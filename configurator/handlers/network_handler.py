@@ -1,12 +1,59 @@
 #!/usr/bin/env python3
 
 import logging
-from flask import jsonify
-from typing import Dict, Any
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
 from ..network import get_network_config
+from ._util import conditional_json_response, encode_json, error_response
 
 logger = logging.getLogger(__name__)
 
+# The network configuration depends on kernel interface state as well as on
+# files, so a cached response is only reused for NETWORK_CACHE_TTL seconds
+# and only while none of NETWORK_CONFIG_FILES changed
+NETWORK_CACHE_TTL = 2.0
+NETWORK_CONFIG_FILES = (
+    "/etc/resolv.conf",
+    "/etc/hostname",
+    "/etc/network/interfaces",
+    "/etc/dhcpcd.conf",
+)
+
+# (monotonic timestamp, file signature, encoded response body)
+_network_cache = None
+_network_cache_lock = threading.Lock()
+
+
+def _config_files_signature() -> Tuple[Optional[Tuple[int, int]], ...]:
+    """Return (mtime_ns, size) of each of NETWORK_CONFIG_FILES, None for missing ones"""
+    signature = []
+    for path in NETWORK_CONFIG_FILES:
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _network_config_body() -> bytes:
+    """Return the encoded success response, reusing a recent one if still valid"""
+    global _network_cache
+    with _network_cache_lock:
+        signature = _config_files_signature()
+        now = time.monotonic()
+        if (_network_cache is not None and now - _network_cache[0] < NETWORK_CACHE_TTL
+                and _network_cache[1] == signature):
+            return _network_cache[2]
+        body = encode_json({
+            'status': 'success',
+            'data': get_network_config()
+        })
+        _network_cache = (now, signature, body)
+        return body
+
 
 class NetworkHandler:
     """Handler for network configuration API endpoints"""
@@ -23,15 +70,7 @@ class NetworkHandler:
             Flask response with network configuration data
         """
         try:
-            config = get_network_config()
-            return jsonify({
-                'status': 'success',
-                'data': config
-            })
+            return conditional_json_response(_network_config_body())
         except Exception as e:
-            logger.error(f"Error getting network configuration: {e}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to retrieve network configuration',
-                'error': str(e)
-            }), 500
+            logger.error("Error getting network configuration: %s", e)
+            return error_response('Failed to retrieve network configuration', e)
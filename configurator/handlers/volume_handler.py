@@ -6,7 +6,8 @@ Provides API endpoints for managing ALSA volume controls including headphone vol
 """
 
 import logging
-from flask import request, jsonify
+from flask import request
+from ._util import conditional_json_response, encode_json, error_body, handle_errors, json_response
 from ..volume import (
     get_available_headphone_controls,
     get_headphone_volume,
@@ -17,6 +18,28 @@ from ..volume import (
 
 logger = logging.getLogger(__name__)
 
+# Bodies of constant error responses, encoded once
+_ERR_NO_HEADPHONE_CONTROLS = error_body("No headphone volume controls available on this sound card")
+_ERR_NO_JSON = error_body("No JSON data provided")
+_ERR_VOLUME_REQUIRED = error_body("volume parameter is required")
+_ERR_VOLUME_RANGE = error_body("Volume must be between 0 and 100")
+_ERR_VOLUME_NOT_INT = error_body("Volume must be a valid integer")
+_ERR_NO_STORED_VOLUME = error_body("No headphone volume settings found or no compatible controls available")
+
+
+def _as_int(value):
+    """
+    Convert a JSON value to int the way int() does, or return None if it
+    can't be converted. Plain ints, what clients normally send, are
+    returned without going through int() and its exception handling.
+    """
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
 
 class VolumeHandler:
     """Handler for volume-related API operations"""
@@ -25,6 +48,7 @@ class VolumeHandler:
         """Initialize the volume handler"""
         pass
     
+    @handle_errors("Failed to list headphone controls")
     def handle_list_headphone_controls(self):
         """
         Handle GET /api/v1/volume/headphone/controls - List available headphone volume controls
@@ -32,25 +56,17 @@ class VolumeHandler:
         Returns:
             JSON response with list of available headphone controls
         """
-        try:
-            controls = get_available_headphone_controls()
-            
-            return jsonify({
-                "status": "success",
-                "data": {
-                    "controls": controls,
-                    "count": len(controls)
-                }
-            })
-            
-        except Exception as e:
-            logger.error(f"Error listing headphone controls: {e}")
-            return jsonify({
-                "status": "error",
-                "message": "Failed to list headphone controls",
-                "error": str(e)
-            }), 500
+        controls = get_available_headphone_controls()
+        
+        return conditional_json_response(encode_json({
+            "status": "success",
+            "data": {
+                "controls": controls,
+                "count": len(controls)
+            }
+        }))
     
+    @handle_errors("Failed to get headphone volume")
     def handle_get_headphone_volume(self):
         """
         Handle GET /api/v1/volume/headphone - Get current headphone volume
@@ -58,31 +74,20 @@ class VolumeHandler:
         Returns:
             JSON response with current headphone volume
         """
-        try:
-            volume, control_name = get_headphone_volume()
-            
-            if volume is not None:
-                return jsonify({
-                    "status": "success",
-                    "data": {
-                        "volume": int(volume),
-                        "control": control_name
-                    }
-                })
-            else:
-                return jsonify({
-                    "status": "error",
-                    "message": "No headphone volume controls available on this sound card"
-                }), 404
-                
-        except Exception as e:
-            logger.error(f"Error getting headphone volume: {e}")
-            return jsonify({
-                "status": "error",
-                "message": "Failed to get headphone volume",
-                "error": str(e)
-            }), 500
+        volume, control_name = get_headphone_volume()
+        
+        if volume is not None:
+            return conditional_json_response(encode_json({
+                "status": "success",
+                "data": {
+                    "volume": int(volume),
+                    "control": control_name
+                }
+            }))
+        else:
+            return json_response(_ERR_NO_HEADPHONE_CONTROLS, 404)
     
+    @handle_errors("Failed to set headphone volume")
     def handle_set_headphone_volume(self):
         """
         Handle POST /api/v1/volume/headphone - Set headphone volume
@@ -95,61 +100,38 @@ class VolumeHandler:
         Returns:
             JSON response with success/error status
         """
-        try:
-            # Parse JSON request
-            data = request.get_json()
-            if not data:
-                return jsonify({
-                    "status": "error",
-                    "message": "No JSON data provided"
-                }), 400
-            
-            volume = data.get('volume')
-            if volume is None:
-                return jsonify({
-                    "status": "error",
-                    "message": "volume parameter is required"
-                }), 400
-            
-            # Validate volume range
-            try:
-                volume_int = int(volume)
-                if volume_int < 0 or volume_int > 100:
-                    return jsonify({
-                        "status": "error",
-                        "message": "Volume must be between 0 and 100"
-                    }), 400
-            except (ValueError, TypeError):
-                return jsonify({
-                    "status": "error",
-                    "message": "Volume must be a valid integer"
-                }), 400
-            
-            # Set the volume
-            result = set_headphone_volume(str(volume_int))
-            
-            if result:
-                return jsonify({
-                    "status": "success",
-                    "message": f"Headphone volume set to {volume_int}%",
-                    "data": {
-                        "volume": volume_int
-                    }
-                })
-            else:
-                return jsonify({
-                    "status": "error",
-                    "message": "No headphone volume controls available on this sound card"
-                }), 404
-                
-        except Exception as e:
-            logger.error(f"Error setting headphone volume: {e}")
-            return jsonify({
-                "status": "error",
-                "message": "Failed to set headphone volume",
-                "error": str(e)
-            }), 500
+        # Parse JSON request. silent=True turns a missing or malformed
+        # body into None instead of raising.
+        data = request.get_json(silent=True)
+        if not data or not isinstance(data, dict):
+            return json_response(_ERR_NO_JSON, 400)
+        
+        volume = data.get('volume')
+        if volume is None:
+            return json_response(_ERR_VOLUME_REQUIRED, 400)
+        
+        # Validate volume range
+        volume_int = _as_int(volume)
+        if volume_int is None:
+            return json_response(_ERR_VOLUME_NOT_INT, 400)
+        if not 0 <= volume_int <= 100:
+            return json_response(_ERR_VOLUME_RANGE, 400)
+        
+        # Set the volume
+        result = set_headphone_volume(str(volume_int))
+        
+        if result:
+            return json_response({
+                "status": "success",
+                "message": f"Headphone volume set to {volume_int}%",
+                "data": {
+                    "volume": volume_int
+                }
+            })
+        else:
+            return json_response(_ERR_NO_HEADPHONE_CONTROLS, 404)
     
+    @handle_errors("Failed to store headphone volume")
     def handle_store_headphone_volume(self):
         """
         Handle POST /api/v1/volume/headphone/store - Store current headphone volume
@@ -157,28 +139,17 @@ class VolumeHandler:
         Returns:
             JSON response with success/error status
         """
-        try:
-            result = store_headphone_volume()
-            
-            if result:
-                return jsonify({
-                    "status": "success",
-                    "message": "Headphone volume stored successfully"
-                })
-            else:
-                return jsonify({
-                    "status": "error",
-                    "message": "No headphone volume controls available on this sound card"
-                }), 404
-                
-        except Exception as e:
-            logger.error(f"Error storing headphone volume: {e}")
-            return jsonify({
-                "status": "error",
-                "message": "Failed to store headphone volume",
-                "error": str(e)
-            }), 500
+        result = store_headphone_volume()
+        
+        if result:
+            return json_response({
+                "status": "success",
+                "message": "Headphone volume stored successfully"
+            })
+        else:
+            return json_response(_ERR_NO_HEADPHONE_CONTROLS, 404)
     
+    @handle_errors("Failed to restore headphone volume")
     def handle_restore_headphone_volume(self):
         """
         Handle POST /api/v1/volume/headphone/restore - Restore stored headphone volume
@@ -186,24 +157,12 @@ class VolumeHandler:
         Returns:
             JSON response with success/error status
         """
-        try:
-            result = restore_headphone_volume()
-            
-            if result:
-                return jsonify({
-                    "status": "success",
-                    "message": "Headphone volume restored successfully"
-                })
-            else:
-                return jsonify({
-                    "status": "error",
-                    "message": "No headphone volume settings found or no compatible controls available"
-                }), 404
-                
-        except Exception as e:
-            logger.error(f"Error restoring headphone volume: {e}")
-            return jsonify({
-                "status": "error",
-                "message": "Failed to restore headphone volume",
-                "error": str(e)
-            }), 500
\ No newline at end of file
+        result = restore_headphone_volume()
+        
+        if result:
+            return json_response({
+                "status": "success",
+                "message": "Headphone volume restored successfully"
+            })
+        else:
+            return json_response(_ERR_NO_STORED_VOLUME, 404)
@@ -15,6 +15,11 @@ logger = logging.getLogger(__name__)
 
 HOSTS_FILE = "/etc/hosts"
 
+# Hostname patterns, compiled once at import
+_HOSTNAME_CHARS_RE = re.compile(r'[a-zA-Z0-9-]+')
+_INVALID_HOSTNAME_CHARS_RE = re.compile(r'[^a-z0-9-]')
+_HYPHEN_RUN_RE = re.compile(r'-+')
+
 
 def read_hosts_file() -> List[str]:
     """
@@ -258,7 +263,7 @@ def validate_hostname(hostname: str) -> bool:
         return False
     
     # Must be ASCII letters, numbers, and hyphens only
-    if not re.match(r'^[a-zA-Z0-9-]+$', hostname):
+    if not _HOSTNAME_CHARS_RE.fullmatch(hostname):
         return False
     
     # Cannot start or end with hyphen
@@ -291,10 +296,10 @@ def sanitize_hostname(pretty_hostname: str, max_length: int = 64) -> str:
     hostname = pretty_hostname.lower().replace(' ', '-')
     
     # Keep only ASCII letters, numbers, and hyphens
-    hostname = re.sub(r'[^a-z0-9-]', '', hostname)
+    hostname = _INVALID_HOSTNAME_CHARS_RE.sub('', hostname)
     
     # Remove leading/trailing hyphens and multiple consecutive hyphens
-    hostname = re.sub(r'-+', '-', hostname).strip('-')
+    hostname = _HYPHEN_RUN_RE.sub('-', hostname).strip('-')
     
     # Limit to max_length characters
     hostname = hostname[:max_length]
@@ -12,13 +12,18 @@ except ImportError:
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Standard 7-bit I2C address range probed by a bus scan
+FIRST_ADDRESS = 0x03
+LAST_ADDRESS = 0x77
 
-def scan_i2c_bus(bus_number=1):
+
+def scan_i2c_bus(bus_number=1, address=None):
     """
     Scan I2C bus for devices and detect which addresses are in use.
     
     Args:
         bus_number: I2C bus number to scan (default: 1)
+        address: Probe only this address instead of the whole range (default: None)
         
     Returns:
         Dictionary with detected devices and kernel-used addresses
@@ -30,20 +35,29 @@ def scan_i2c_bus(bus_number=1):
     kernel_used = []
     
     try:
-        # Open I2C bus
-        bus = smbus2.SMBus(bus_number)
-        
-        # Scan addresses 0x03 to 0x77 (standard I2C address range)
-        for addr in range(0x03, 0x78):
-            try:
-                # Try to read a byte from the device
-                bus.read_byte(addr)
-                detected_devices.append(f"0x{addr:02x}")
-            except OSError:
-                # Device not present or not responding
-                pass
+        # Scan addresses 0x03 to 0x77 (standard I2C address range), or
+        # just the requested one
+        if address is None:
+            addresses = range(FIRST_ADDRESS, LAST_ADDRESS + 1)
+            scan_range = f"0x{FIRST_ADDRESS:02x}-0x{LAST_ADDRESS:02x}"
+        else:
+            addresses = (address,)
+            scan_range = f"0x{address:02x}"
         
-        bus.close()
+        # Open the I2C bus once for all probes; the context manager closes
+        # it even if a probe fails unexpectedly. Probes can't be batched into
+        # one I2C_RDWR transfer, as the kernel aborts it at the first
+        # address that doesn't acknowledge.
+        with smbus2.SMBus(bus_number) as bus:
+            read_byte = bus.read_byte
+            for addr in addresses:
+                try:
+                    # Try to read a byte from the device
+                    read_byte(addr)
+                    detected_devices.append(f"0x{addr:02x}")
+                except OSError:
+                    # Device not present or not responding
+                    pass
         
         # Check for kernel-used addresses by reading /sys/bus/i2c/devices/
         try:
@@ -69,16 +83,17 @@ def scan_i2c_bus(bus_number=1):
         'bus_number': bus_number,
         'detected_devices': sorted(detected_devices),
         'kernel_used': sorted(kernel_used),
-        'scan_range': '0x03-0x77'
+        'scan_range': scan_range
     }
 
 
-def get_i2c_info(bus_number=1):
+def get_i2c_info(bus_number=1, address=None):
     """
     Get I2C bus information including device scan results.
     
     Args:
         bus_number: I2C bus number to scan (default: 1)
+        address: Probe only this address instead of the whole range (default: None)
         
     Returns:
         Dictionary with I2C bus information and device scan results
@@ -103,7 +118,7 @@ def get_i2c_info(bus_number=1):
         return result
     
     try:
-        scan_result = scan_i2c_bus(bus_number)
+        scan_result = scan_i2c_bus(bus_number, address)
         result.update(scan_result)
     except Exception as e:
         result['error'] = str(e)
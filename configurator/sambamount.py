@@ -130,6 +130,23 @@ def read_mount_config(secure: bool = False) -> List[Dict[str, str]]:
     logger.debug(f"Read {len(mounts)} mount configurations from configdb")
     return mounts
 
+def _mount_config_pairs(db: ConfigDB, prefix: str, mount: Dict[str, str]) -> List[Tuple[str, str]]:
+    """
+    Build the configdb key/value pairs for a single mount configuration.
+
+    The password is encrypted here so that all keys of a mount can be
+    written together with a single ConfigDB.set_many() call.
+    """
+    return [
+        (f"{prefix}.server", mount['server']),
+        (f"{prefix}.share", mount['share']),
+        (f"{prefix}.mountpoint", mount['mountpoint']),
+        (f"{prefix}.user", mount['user']),
+        (f"{prefix}.password", db.encrypt_value(mount['password'] or '')),  # Encrypt password
+        (f"{prefix}.version", mount['version']),
+        (f"{prefix}.options", mount['options']),
+    ]
+
 def write_mount_config(mounts: List[Dict[str, str]]) -> bool:
     """
     Write the mount configurations to the config database.
@@ -156,16 +173,12 @@ def write_mount_config(mounts: List[Dict[str, str]]) -> bool:
             db.delete(f"{prefix}.options")
             index += 1
 
-        # Write new configurations
+        # Write new configurations in a single transaction
+        pairs = []
         for i, mount in enumerate(mounts, start=1):
-            prefix = f"smbmount.{i}"
-            db.set(f"{prefix}.server", mount['server'])
-            db.set(f"{prefix}.share", mount['share'])
-            db.set(f"{prefix}.mountpoint", mount['mountpoint'])
-            db.set(f"{prefix}.user", mount['user'])
-            db.set(f"{prefix}.password", mount['password'], secure=True)  # Encrypt password
-            db.set(f"{prefix}.version", mount['version'])
-            db.set(f"{prefix}.options", mount['options'])
+            pairs.extend(_mount_config_pairs(db, f"smbmount.{i}", mount))
+        if not db.set_many(pairs):
+            return False
 
         logger.debug(f"Wrote {len(mounts)} mount configurations to configdb")
         return True
@@ -231,14 +244,9 @@ def add_mount_config(server: str, share: str, mountpoint: Optional[str] = None,
         prefix = f"smbmount.{next_id}"
         
         # Write the new mount configuration directly
-        db.set(f"{prefix}.server", new_mount['server'])
-        db.set(f"{prefix}.share", new_mount['share'])
-        db.set(f"{prefix}.mountpoint", new_mount['mountpoint'])
-        db.set(f"{prefix}.user", new_mount['user'])
-        db.set(f"{prefix}.password", new_mount['password'], secure=True)  # Encrypt password
-        db.set(f"{prefix}.version", new_mount['version'])
-        db.set(f"{prefix}.options", new_mount['options'])
-        
+        if not db.set_many(_mount_config_pairs(db, prefix, new_mount)):
+            return False, f"Failed to save mount configuration for {server}/{share}"
+
         logger.debug(f"Added mount configuration {next_id} for {server}/{share} to configdb")
         return True, None
         
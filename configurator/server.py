@@ -23,6 +23,7 @@ except ImportError:
 
 # Import the ConfigDB class
 from .configdb import ConfigDB
+from .handlers._util import ORJSONProvider
 from .handlers import SystemdHandler, SMBHandler, HostnameHandler, SoundcardHandler, SystemHandler, FilesystemHandler, ScriptHandler, NetworkHandler, I2CHandler, VolumeHandler, BluetoothHandler, PlayerRegistryHandler, BLEProvisioningHandler, ExtensionsHandler
 from .systeminfo import SystemInfo
 from ._version import __version__
@@ -52,6 +53,8 @@ class ConfigAPIServer:
         
         logger.info("ConfigAPIServer.__init__: Creating Flask app")
         self.app = Flask(__name__)
+        if ORJSONProvider is not None:
+            self.app.json = ORJSONProvider(self.app)
         
         logger.info("ConfigAPIServer.__init__: Creating ConfigDB")
         self.configdb = ConfigDB()
@@ -356,16 +359,17 @@ class ConfigAPIServer:
             """Mount all configured Samba shares via systemd service"""
             return self.smb_handler.handle_mount_all_samba()
 
-        # Hostname endpoints
-        @self.app.route('/api/v1/hostname', methods=['GET'])
-        def get_hostname():
-            """Get current system and pretty hostnames"""
-            return self.hostname_handler.handle_get_hostname()
-        
-        @self.app.route('/api/v1/hostname', methods=['POST'])
-        def set_hostname():
-            """Set system hostname and/or pretty hostname"""
-            return self.hostname_handler.handle_set_hostname()
+        # Hostname endpoints. These handlers don't need any wrapping, so the
+        # bound methods are registered as the views directly. strict_slashes
+        # is off so a trailing slash reaches the same view instead of a 404.
+        # Get current system and pretty hostnames
+        self.app.add_url_rule('/api/v1/hostname', 'get_hostname',
+                              self.hostname_handler.handle_get_hostname,
+                              methods=['GET'], strict_slashes=False)
+        # Set system hostname and/or pretty hostname
+        self.app.add_url_rule('/api/v1/hostname', 'set_hostname',
+                              self.hostname_handler.handle_set_hostname,
+                              methods=['POST'], strict_slashes=False)
 
         # Soundcard endpoints
         @self.app.route('/api/v1/soundcards', methods=['GET'])
@@ -467,17 +471,15 @@ class ConfigAPIServer:
             """Execute a configured script"""
             return self.script_handler.handle_execute_script(script_id)
 
-        # Network configuration endpoint
-        @self.app.route('/api/v1/network', methods=['GET'])
-        def get_network_config():
-            """Get network configuration including hostname and interface details"""
-            return self.network_handler.handle_get_network_config()
+        # Network configuration endpoint (hostname and interface details)
+        self.app.add_url_rule('/api/v1/network', 'get_network_config',
+                              self.network_handler.handle_get_network_config,
+                              methods=['GET'], strict_slashes=False)
 
         # I2C device scan endpoint
-        @self.app.route('/api/v1/i2c/devices', methods=['GET'])
-        def get_i2c_devices():
-            """Scan I2C bus for devices"""
-            return self.i2c_handler.handle_get_i2c_devices()
+        self.app.add_url_rule('/api/v1/i2c/devices', 'get_i2c_devices',
+                              self.i2c_handler.handle_get_i2c_devices,
+                              methods=['GET'], strict_slashes=False)
 
         # Bluetooth endpoints
         @self.app.route('/api/v1/bluetooth/settings', methods=['GET'])
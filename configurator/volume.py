@@ -42,6 +42,10 @@ HEADPHONE_VOLUME_CONTROLS = ["Headphone"]
 _cached_card_index = None
 _cached_soundcard = None
 
+# Cache for the headphone controls of the sound card: (card_index, controls).
+# Mixer controls only change with the card, which is cached above as well.
+_cached_headphone_controls = None
+
 def get_cached_card_index():
     """
     Get the cached sound card index, initializing cache if needed
@@ -194,9 +198,11 @@ def store_volume():
             if volume is not None:
                 # Store in database
                 db = ConfigDB()
-                db.set(VOLUME_DB_KEY, volume)
-                db.set(VOLUME_CARD_DB_KEY, str(card_index))
-                db.set(VOLUME_CONTROL_DB_KEY, control_name)
+                db.set_many([
+                    (VOLUME_DB_KEY, volume),
+                    (VOLUME_CARD_DB_KEY, str(card_index)),
+                    (VOLUME_CONTROL_DB_KEY, control_name),
+                ])
                 
                 logging.info(f"Physical card volume {volume} stored for card {card_index}, control '{control_name}'")
             else:
@@ -211,12 +217,13 @@ def store_volume():
         if not headphone_result:
             logging.info("No headphone volume controls available or failed to store")
         
-        # Store PipeWire virtual controls if available
-        if is_pipewire_available():
+        # Store PipeWire virtual controls if available. Checking for the
+        # Master control and reading it is a single mixer access.
+        pipewire_available, master_volume = read_pipewire_master()
+        if pipewire_available:
             db = ConfigDB()
             
             # Store Master volume
-            master_volume = get_pipewire_volume('Master')
             if master_volume is not None:
                 db.set(PIPEWIRE_MASTER_VOLUME_KEY, master_volume)
                 logging.info(f"PipeWire Master volume {master_volume} stored")
@@ -345,6 +352,47 @@ def is_pipewire_available():
         except subprocess.CalledProcessError:
             return False
 
+def read_pipewire_master():
+    """
+    Check if PipeWire virtual controls are available and read the Master
+    volume with the same mixer access
+    
+    Returns:
+        Tuple of (available, volume) where volume is a string as returned by
+        get_pipewire_volume(), or None if it couldn't be read
+    """
+    if ALSA_AVAILABLE:
+        try:
+            mixer = alsaaudio.Mixer('Master', cardindex=-1)
+        except Exception:
+            return False, None
+        try:
+            volume = mixer.getvolume()
+        except Exception as e:
+            logging.error(f"Error getting PipeWire volume via ALSA API: {str(e)}")
+            return True, None
+        if not volume:
+            logging.warning("No volume data returned for PipeWire control 'Master'")
+            return True, None
+        return True, str(volume[0])
+    else:
+        # Fallback to subprocess
+        try:
+            output = subprocess.check_output("amixer get Master", shell=True, text=True)
+        except subprocess.CalledProcessError:
+            return False, None
+        if "Simple mixer control 'Master'" not in output:
+            return False, None
+        
+        # Look for percentage in the output, e.g. [80%]
+        import re
+        matches = re.search(r'\[(\d+)%\]', output)
+        if matches:
+            return True, matches.group(1)
+        
+        logging.warning(f"Could not parse volume from PipeWire output: {output}")
+        return True, None
+
 def get_pipewire_volume(control_name):
     """
     Get the current volume setting from PipeWire virtual controls
@@ -445,6 +493,8 @@ def get_available_headphone_controls():
     Returns:
         List of available headphone control names, empty if none found
     """
+    global _cached_headphone_controls
+    
     try:
         card_index = get_cached_card_index()
         
@@ -452,6 +502,9 @@ def get_available_headphone_controls():
             logging.error("No sound card detected")
             return []
         
+        if _cached_headphone_controls is not None and _cached_headphone_controls[0] == card_index:
+            return list(_cached_headphone_controls[1])
+        
         # Get all available controls on the sound card
         available_controls = list_available_controls(card_index)
         
@@ -461,6 +514,10 @@ def get_available_headphone_controls():
             if control in available_controls:
                 headphone_controls.append(control)
         
+        # An empty control list means listing failed, so try again next time
+        if available_controls:
+            _cached_headphone_controls = (card_index, tuple(headphone_controls))
+        
         return headphone_controls
     except Exception as e:
         logging.error(f"Error getting available headphone controls: {str(e)}")
@@ -568,9 +625,11 @@ def store_headphone_volume():
         if volume is not None:
             # Store in database
             db = ConfigDB()
-            db.set(HEADPHONE_VOLUME_DB_KEY, volume)
-            db.set(HEADPHONE_VOLUME_CARD_DB_KEY, str(card_index))
-            db.set(HEADPHONE_VOLUME_CONTROL_DB_KEY, control_name)
+            db.set_many([
+                (HEADPHONE_VOLUME_DB_KEY, volume),
+                (HEADPHONE_VOLUME_CARD_DB_KEY, str(card_index)),
+                (HEADPHONE_VOLUME_CONTROL_DB_KEY, control_name),
+            ])
             
             logging.info(f"Headphone volume {volume} stored for card {card_index}, control '{control_name}'")
             return True
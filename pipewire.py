@@ -3,13 +3,27 @@ pipewire.py - PipeWire volume control utility
 
 Provides functions to get/set volume for a given control name and list all available volume controls.
 """
+import shutil
 import subprocess
 import json
 from typing import List, Optional
 
+# Resolved path of pw-cli; looked up on first use so every call doesn't search
+# PATH again, and so nothing is forked when PipeWire isn't installed
+_pw_cli_path = None
+
+def _pw_cli() -> Optional[str]:
+    global _pw_cli_path
+    if _pw_cli_path is None:
+        _pw_cli_path = shutil.which("pw-cli") or ""
+    return _pw_cli_path or None
+
 def _run_pw_cli(args: List[str]) -> Optional[str]:
+    pw_cli = _pw_cli()
+    if pw_cli is None:
+        return None
     try:
-        result = subprocess.run(["pw-cli"] + args, capture_output=True, text=True, check=True)
+        result = subprocess.run([pw_cli] + args, capture_output=True, text=True, check=True)
         return result.stdout
     except Exception:
         return None
@@ -55,8 +69,11 @@ def set_volume(control_name: str, volume: float) -> bool:
     Volume should be a float between 0.0 and 1.0.
     Returns True if successful, False otherwise.
     """
+    pw_cli = _pw_cli()
+    if pw_cli is None:
+        return False
     try:
-        subprocess.run(["pw-cli", "set", control_name, "volume", str(volume)], check=True)
+        subprocess.run([pw_cli, "set", control_name, "volume", str(volume)], check=True)
         return True
     except Exception:
         return False
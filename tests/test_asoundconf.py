@@ -0,0 +1,16 @@
+from configurator.asoundconf import ALSAConfig
+
+
+def test_save_only_writes_changes(tmp_path):
+    path = tmp_path / "asound.conf"
+    cfg = ALSAConfig(filename=str(path))
+    cfg.create_simple_config(hw=1, channels=2)
+    assert cfg.save() is True
+    assert "card 1" in path.read_text()
+    assert cfg.save() is False
+
+    cfg = ALSAConfig(filename=str(path))
+    cfg.create_simple_config(hw=1, channels=2)
+    assert cfg.save() is False
+    cfg.create_simple_config(hw=2, channels=2)
+    assert cfg.save() is True
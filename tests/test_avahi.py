@@ -0,0 +1,108 @@
+import pytest
+
+from configurator import avahi
+from configurator.avahi import configure_avahi_interfaces, _rewrite_avahi_config
+
+
+STOCK_CONFIG = (
+    "[server]\n"
+    "use-ipv4=yes\n"
+    "#allow-interfaces=eth0\n"
+    "#deny-interfaces=eth1\n"
+    "\n"
+    "[wide-area]\n"
+    "enable-wide-area=yes\n"
+)
+
+CONFIGURED = (
+    "[server]\n"
+    "use-ipv4=yes\n"
+    "\n"
+    "allow-interfaces=eth0,wlan0\n"
+    "[wide-area]\n"
+    "enable-wide-area=yes\n"
+)
+
+
+def test_rewrite_replaces_interface_lines_in_server_section():
+    assert _rewrite_avahi_config(STOCK_CONFIG) == CONFIGURED
+
+
+def test_rewrite_is_idempotent():
+    assert _rewrite_avahi_config(CONFIGURED) == CONFIGURED
+
+
+def test_rewrite_appends_when_server_is_last_section():
+    text = "[wide-area]\nenable-wide-area=yes\n[server]\ndeny-interfaces=eth1"
+    assert _rewrite_avahi_config(text) == (
+        "[wide-area]\nenable-wide-area=yes\n[server]\nallow-interfaces=eth0,wlan0\n"
+    )
+
+
+def test_rewrite_leaves_other_sections_alone():
+    text = "[reflector]\nallow-interfaces=eth1\n"
+    assert _rewrite_avahi_config(text) == text
+
+
+def test_configured_file_is_not_rewritten(tmp_path, monkeypatch):
+    conf = tmp_path / "avahi-daemon.conf"
+    conf.write_text(CONFIGURED)
+    calls = []
+    monkeypatch.setattr(avahi.subprocess, "run", lambda *a, **kw: calls.append(a))
+
+    assert configure_avahi_interfaces(str(conf)) is True
+    assert conf.read_text() == CONFIGURED
+    assert calls == []
+    assert not (tmp_path / "avahi-daemon.conf.backup").exists()
+
+
+def test_stock_file_is_rewritten_with_backup(tmp_path, monkeypatch):
+    conf = tmp_path / "avahi-daemon.conf"
+    conf.write_text(STOCK_CONFIG)
+
+    class Result:
+        returncode = 0
+        stderr = ""
+
+    monkeypatch.setattr(avahi.subprocess, "run", lambda *a, **kw: Result())
+
+    assert configure_avahi_interfaces(str(conf)) is True
+    assert conf.read_text() == CONFIGURED
+    assert (tmp_path / "avahi-daemon.conf.backup").read_text() == STOCK_CONFIG
+
+
+def test_failed_restart_is_reported(tmp_path, monkeypatch):
+    conf = tmp_path / "avahi-daemon.conf"
+    conf.write_text(STOCK_CONFIG)
+    calls = []
+
+    class Result:
+        returncode = 1
+        stderr = "Job for avahi-daemon.service failed."
+
+    monkeypatch.setattr(avahi, "_is_unit_active", lambda unit: True)
+    monkeypatch.setattr(avahi.subprocess, "run", lambda args, **kw: calls.append(args) or Result())
+
+    assert configure_avahi_interfaces(str(conf)) is False
+    assert calls == [["systemctl", "restart", "avahi-daemon.service"]]
+
+
+def test_configured_file_is_not_rescanned(tmp_path, monkeypatch):
+    conf = tmp_path / "avahi-daemon.conf"
+    conf.write_text(CONFIGURED)
+    monkeypatch.setattr(avahi, "_rewrite_avahi_config",
+                        lambda text: pytest.fail("file must not be rewritten"))
+    assert configure_avahi_interfaces(str(conf)) is True
+
+
+def test_deny_line_forces_rewrite(tmp_path, monkeypatch):
+    conf = tmp_path / "avahi-daemon.conf"
+    conf.write_text(CONFIGURED.replace("[wide-area]", "deny-interfaces=eth1\n[wide-area]"))
+    monkeypatch.setattr(avahi, "_is_unit_active", lambda unit: False)
+    monkeypatch.setattr(avahi, "_unit_action", lambda action, unit: (True, ""))
+    assert configure_avahi_interfaces(str(conf)) is True
+    assert "deny-interfaces" not in conf.read_text()
+
+
+def test_missing_config_is_skipped(tmp_path):
+    assert configure_avahi_interfaces(str(tmp_path / "missing.conf")) is True
@@ -0,0 +1,52 @@
+import pytest
+pytest.importorskip("dbus", reason="dbus-python is absent in the build chroot")
+
+from configurator.bluetooth import ConfigFileManager
+
+
+def _manager(tmp_path, monkeypatch):
+    conf = tmp_path / "bluetooth.conf"
+    conf.write_text("[Bluetooth]\ncapability=NoInputNoOutput\ndiscoverable_timeout=30\n")
+    monkeypatch.setattr(ConfigFileManager, "config_path", conf)
+    return conf, ConfigFileManager()
+
+
+def test_values_are_written_and_converted(tmp_path, monkeypatch):
+    conf, cfm = _manager(tmp_path, monkeypatch)
+    cfm.set_config_values("Bluetooth", {"Discoverable": "no", "discoverable_timeout": 60})
+    assert cfm.discoverable is False
+    assert cfm.discoverable_timeout == 60
+    assert "discoverable_timeout=60\n" in conf.read_text()
+    assert not cfm.is_stale()
+
+
+def test_invalid_value_changes_nothing(tmp_path, monkeypatch):
+    conf, cfm = _manager(tmp_path, monkeypatch)
+    before = conf.read_text()
+    cfm.set_config_values("Bluetooth", {"discoverable": "no", "discoverable_timeout": "abc"})
+    assert conf.read_text() == before
+    assert cfm.discoverable is True
+    assert cfm.discoverable_timeout == 30
+    assert cfm.config["Bluetooth"]["discoverable_timeout"] == "30"
+    assert not cfm.is_stale()
+
+
+def test_reset_dbus_drops_dead_bus(monkeypatch):
+    from configurator import bluetooth
+
+    class DeadBus:
+        closed = False
+
+        def get_is_connected(self):
+            return False
+
+        def close(self):
+            self.closed = True
+
+    bus = DeadBus()
+    monkeypatch.setattr(bluetooth, "_bus", bus)
+    monkeypatch.setattr(bluetooth, "_object_manager", object())
+    bluetooth._reset_dbus()
+    assert bus.closed
+    assert bluetooth._bus is None
+    assert bluetooth._object_manager is None
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+flask = pytest.importorskip("flask", reason="Flask is absent in the build chroot")
+pytest.importorskip("dbus", reason="dbus-python is absent in the build chroot")
+
+from flask import Flask
+
+from configurator.handlers.bluetooth_handler import BluetoothHandler
+
+
+def _call(fn, *args, **kwargs):
+    """Invoke a handler inside a request context and return (status, payload)."""
+    app = Flask(__name__)
+    with app.test_request_context(**kwargs):
+        result = fn(*args)
+    if isinstance(result, tuple):
+        response, status = result
+    else:
+        response, status = result, 200
+    return status, json.loads(response.get_data(as_text=True))
+
+
+def test_passkey_is_returned_once():
+    handler = BluetoothHandler()
+    status, _ = _call(handler.handle_set_bluetooth_passkey, method="POST",
+                      query_string={"passkey": "123456"})
+    assert status == 200
+    assert _call(handler.handle_get_bluetooth_passkey)[1]["passkey"] == "123456"
+    assert _call(handler.handle_get_bluetooth_passkey)[1]["passkey"] is None
+
+
+def test_modal_is_returned_once():
+    handler = BluetoothHandler()
+    _call(handler.handle_set_show_modal, method="POST", query_string={"modal": "pair"})
+    assert _call(handler.handle_get_show_modal)[1]["modal"] == "pair"
+    assert _call(handler.handle_get_show_modal)[1]["modal"] is None
@@ -0,0 +1,96 @@
+import json
+import os
+
+from configurator import config_parser
+from configurator.config_parser import ConfigParser
+
+
+def _write(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_repeated_loads_reuse_parsed_config(tmp_path, monkeypatch):
+    cfg = tmp_path / "configserver.json"
+    _write(cfg, {"systemd": {"a": "status"}})
+    parser = ConfigParser(str(cfg))
+    first = parser.get_config()
+
+    calls = []
+    monkeypatch.setattr(parser, "_read_config", lambda: calls.append(1) or {})
+    assert parser.get_config() is first
+    assert ConfigParser(str(cfg)).get_config() is first
+    assert calls == []
+
+
+def test_loaded_config_is_returned_without_syscalls(tmp_path, monkeypatch):
+    cfg = tmp_path / "configserver.json"
+    _write(cfg, {"systemd": {"a": "status"}})
+    parser = ConfigParser(str(cfg))
+    first = parser.get_config()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("filesystem accessed")
+
+    monkeypatch.setattr(config_parser.os, "stat", fail)
+    monkeypatch.setattr(config_parser.glob, "glob", fail)
+    assert parser.get_config() is first
+    assert parser.get_section("systemd") == {"a": "status"}
+
+
+def test_modified_file_is_reloaded(tmp_path):
+    cfg = tmp_path / "configserver.json"
+    _write(cfg, {"systemd": {"a": "status"}})
+    parser = ConfigParser(str(cfg))
+    assert parser.get_section("systemd") == {"a": "status"}
+
+    _write(cfg, {"systemd": {"a": "all"}})
+    _bump_mtime(cfg)
+    assert parser.get_section("systemd") == {"a": "status"}
+    parser.load_config()
+    assert parser.get_section("systemd") == {"a": "all"}
+
+
+def test_new_drop_in_is_picked_up(tmp_path):
+    cfg = tmp_path / "configserver.json"
+    _write(cfg, {"systemd": {"a": "status"}})
+    parser = ConfigParser(str(cfg))
+    assert parser.get_section("systemd") == {"a": "status"}
+
+    os.makedirs(tmp_path / "conf.d")
+    _write(tmp_path / "conf.d" / "ext.json", {"systemd": {"b": "all"}})
+    parser.load_config()
+    assert parser.get_section("systemd") == {"a": "status", "b": "all"}
+
+
+def test_reload_config_bypasses_cache(tmp_path, monkeypatch):
+    cfg = tmp_path / "configserver.json"
+    _write(cfg, {"x": {}})
+    parser = ConfigParser(str(cfg))
+    parser.get_config()
+    monkeypatch.setattr(parser, "_read_config", lambda: {"reloaded": {}})
+    assert parser.reload_config() == {"reloaded": {}}
+    assert config_parser._CACHE[str(cfg)][1] == {"reloaded": {}}
+
+
+def test_missing_file_returns_empty(tmp_path):
+    assert ConfigParser(str(tmp_path / "missing.json")).get_config() == {}
+
+
+def test_invalid_json_returns_empty(tmp_path):
+    cfg = tmp_path / "configserver.json"
+    cfg.write_text("{not json")
+    assert ConfigParser(str(cfg)).get_config() == {}
+
+
+def test_invalid_drop_in_is_skipped(tmp_path):
+    cfg = tmp_path / "configserver.json"
+    _write(cfg, {"systemd": {"a": "status"}})
+    os.makedirs(tmp_path / "conf.d")
+    (tmp_path / "conf.d" / "broken.json").write_text("{")
+    assert ConfigParser(str(cfg)).get_section("systemd") == {"a": "status"}
@@ -0,0 +1,213 @@
+import os
+import threading
+
+import pytest
+
+from configurator.configdb import ConfigDB, SQL_GET_ALL_PREFIX
+
+
+def _db(tmp_path):
+    return ConfigDB(db_path=str(tmp_path / "config.sqlite"))
+
+
+def test_set_get_delete_roundtrip(tmp_path):
+    db = _db(tmp_path)
+    assert db.set("a.b", "1") is True
+    assert db.get("a.b") == "1"
+    assert db.delete("a.b") is True
+    assert db.get("a.b", default="x") == "x"
+
+
+def test_connection_is_reused_across_calls(tmp_path):
+    db = _db(tmp_path)
+    conn = db._conn
+    db.set("k", "v")
+    db.get("k")
+    db.list_keys()
+    db.get_all()
+    assert db._conn is conn
+
+
+def test_prefix_filters_and_get_all(tmp_path):
+    db = _db(tmp_path)
+    db.set("volume.main", "50")
+    db.set("volume.aux", "20")
+    db.set("other", "x")
+    assert sorted(db.list_keys("volume.")) == ["volume.aux", "volume.main"]
+    assert db.get_all("volume.") == {"volume.main": "50", "volume.aux": "20"}
+
+
+def test_writes_are_visible_to_other_instances(tmp_path):
+    db1 = _db(tmp_path)
+    db2 = _db(tmp_path)
+    db1.set("shared", "1")
+    assert db2.get("shared") == "1"
+
+
+def test_close_reopens_lazily(tmp_path):
+    db = _db(tmp_path)
+    db.set("k", "v")
+    db.close()
+    assert db._conn is None
+    assert db.get("k") == "v"
+
+
+def test_concurrent_writers_share_connection(tmp_path):
+    db = _db(tmp_path)
+
+    def worker(n):
+        for i in range(20):
+            db.set(f"t{n}.{i}", str(i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(db.list_keys()) == 80
+
+
+def test_set_many_writes_all_pairs(tmp_path):
+    db = _db(tmp_path)
+    assert db.set_many([("a", "1"), ("b", "2")]) is True
+    assert db.get_all() == {"a": "1", "b": "2"}
+
+
+def test_set_many_is_atomic(tmp_path):
+    db = _db(tmp_path)
+    db.set("keep", "old")
+    # A non-bindable value aborts the batch; nothing from it must persist.
+    assert db.set_many([("keep", "new"), ("bad", object())]) is False
+    assert db.get("keep") == "old"
+    assert db.get("bad") is None
+
+
+def test_get_is_served_from_cache(tmp_path):
+    db = _db(tmp_path)
+    db.set("k", "v")
+    db.get("k")
+    assert db._cache["k"] == ("v",)
+    db.delete("k")
+    assert db.get("k", default="gone") == "gone"
+
+
+def test_cache_sees_writes_from_other_connections(tmp_path):
+    db1 = _db(tmp_path)
+    db2 = _db(tmp_path)
+    db1.set("shared", "1")
+    assert db2.get("shared") == "1"
+    db1.set("shared", "2")
+    assert db2.get("shared") == "2"
+    db1.delete("shared")
+    assert db2.get("shared") is None
+
+
+def test_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr("configurator.configdb.CACHE_SIZE", 3)
+    db = _db(tmp_path)
+    for i in range(5):
+        db.get(f"k{i}")
+    assert list(db._cache) == ["k2", "k3", "k4"]
+
+
+def test_iter_all_streams_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr("configurator.configdb.FETCH_BATCH_SIZE", 2)
+    db = _db(tmp_path)
+    db.set_many([(f"k{i}", str(i)) for i in range(5)])
+    db.set("other", "x")
+    assert sorted(db.iter_all("k")) == [(f"k{i}", str(i)) for i in range(5)]
+    assert len(dict(db.iter_all())) == 6
+
+
+def test_set_same_value_keeps_modified_at(tmp_path):
+    db = _db(tmp_path)
+    db.set("k", "v")
+    conn = db._connect()
+    conn.execute("UPDATE config SET modified_at = '2000-01-01 00:00:00' WHERE key = 'k'")
+    db.set("k", "v")
+    row = conn.execute("SELECT modified_at FROM config WHERE key = 'k'").fetchone()
+    assert row[0] == "2000-01-01 00:00:00"
+    db.set("k", "w")
+    row = conn.execute("SELECT value, modified_at FROM config WHERE key = 'k'").fetchone()
+    assert row[0] == "w" and row[1] != "2000-01-01 00:00:00"
+
+
+def test_secure_values_reuse_cached_cipher(tmp_path, monkeypatch):
+    monkeypatch.setattr("configurator.configdb.KEY_FILE", str(tmp_path / "configdb.key"))
+    monkeypatch.setattr("configurator.configdb._fernet", None)
+    db = _db(tmp_path)
+    assert db.set("secret", "hunter2", secure=True) is True
+    assert db.get("secret") != "hunter2"
+    assert db.get("secret", secure=True) == "hunter2"
+
+    monkeypatch.setattr(db, "_get_encryption_key",
+                        lambda: pytest.fail("key file must only be read once"))
+    assert db.decrypt_value(db.encrypt_value("again")) == "again"
+
+
+def test_schema_setup_runs_once_per_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.sqlite")
+    ConfigDB(db_path=path)
+    monkeypatch.setattr("configurator.configdb.os.makedirs",
+                        lambda *a, **kw: pytest.fail("setup must not run again"))
+    db = ConfigDB(db_path=path)
+    assert db._conn is None
+    assert db.set("k", "v") is True
+
+
+def test_deleted_database_is_recreated(tmp_path):
+    path = tmp_path / "config.sqlite"
+    ConfigDB(db_path=str(path)).close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(f"{path}{suffix}"):
+            os.unlink(f"{path}{suffix}")
+    db = ConfigDB(db_path=str(path))
+    assert db.set("k", "v") is True
+    assert db.get("k") == "v"
+
+
+def test_connection_pragmas(tmp_path):
+    db = _db(tmp_path)
+    conn = db._connect()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA mmap_size").fetchone()[0] > 0
+
+
+def test_refresh_drops_cached_values(tmp_path):
+    db = _db(tmp_path)
+    db.set("a", "1")
+    assert db.get("a") == "1"
+    db._cache["a"] = ("stale",)
+    assert db.get("a") == "stale"
+    db.refresh()
+    assert db.get("a") == "1"
+
+
+def test_secure_values_are_cached_encrypted(tmp_path, monkeypatch):
+    monkeypatch.setattr("configurator.configdb.KEY_FILE", str(tmp_path / "key"))
+    monkeypatch.setattr("configurator.configdb._fernet", None)
+    db = _db(tmp_path)
+    db.set("pw", "secret", secure=True)
+    assert db.get("pw", secure=True) == "secret"
+    assert db.get("pw") != "secret"
+
+
+def test_prefix_queries_match_literal_prefix(tmp_path):
+    db = _db(tmp_path)
+    db.set_many([
+        ("volume_left", "1"),
+        ("volume_right", "2"),
+        ("volumeXmax", "3"),
+        ("Volume_other", "4"),
+        ("volume", "5"),
+        ("volume_é", "6"),
+    ])
+    assert sorted(db.list_keys("volume_")) == ["volume_left", "volume_right", "volume_é"]
+    assert db.get_all("volume_") == {"volume_left": "1", "volume_right": "2", "volume_é": "6"}
+
+
+def test_prefix_query_uses_primary_key_index(tmp_path):
+    db = _db(tmp_path)
+    plan = db._connect().execute("EXPLAIN QUERY PLAN " + SQL_GET_ALL_PREFIX, ("a", "b")).fetchall()
+    assert any("USING INDEX" in row[-1] for row in plan)
@@ -0,0 +1,123 @@
+import pytest
+
+from configurator.configtxt import ConfigTxt
+
+
+def _cfg(tmp_path, content):
+    p = tmp_path / "config.txt"
+    p.write_text(content)
+    return ConfigTxt(file_path=str(p))
+
+
+def test_update_lines_replaces_first_match_and_appends_rest(tmp_path):
+    cfg = _cfg(tmp_path, "enable_uart=0\ndtparam=audio=on\nenable_uart=0\n")
+    cfg._update_lines({
+        "enable_uart=": "enable_uart=1\n",
+        "dtoverlay=uart0": "dtoverlay=uart0\n",
+        "dtoverlay=disable-bt": "dtoverlay=disable-bt\n",
+    })
+    assert cfg.lines == [
+        "enable_uart=1\n",
+        "dtparam=audio=on\n",
+        "enable_uart=0\n",
+        "dtoverlay=uart0\n",
+        "dtoverlay=disable-bt\n",
+    ]
+
+
+def test_enable_updi_is_idempotent(tmp_path):
+    cfg = _cfg(tmp_path, "dtparam=audio=off\n")
+    cfg.enable_updi()
+    first = list(cfg.lines)
+    cfg.enable_updi()
+    assert cfg.lines == first
+
+
+def test_save_without_changes_writes_nothing(tmp_path):
+    cfg = _cfg(tmp_path, "dtparam=audio=off\n")
+    cfg.disable_onboard_sound()
+    cfg.save()
+    assert cfg.changes_made is False
+    assert not (tmp_path / "config.txt.backup").exists()
+
+
+def test_save_writes_changes_once(tmp_path):
+    cfg = _cfg(tmp_path, "dtparam=audio=on\n")
+    cfg.disable_onboard_sound()
+    cfg.save()
+    assert cfg.changes_made is True
+    assert (tmp_path / "config.txt").read_text() == "dtparam=audio=off\n"
+    assert (tmp_path / "config.txt.backup").read_text() == "dtparam=audio=on\n"
+
+    cfg.save()
+    assert cfg.changes_made is False
+
+
+DEFAULT_CONFIG_SAMPLES = [
+    "",
+    "dtparam=audio=on\ndtoverlay=vc4-kms-v3d\n",
+    """\
+# HiFiBerry card: DAC+
+dtoverlay=hifiberry-dacplus
+force_eeprom_read=0
+dtparam=audio=on
+dtoverlay=vc4-kms-v3d
+dtoverlay=i2c-gpio,i2c_gpio_sda=0,i2c_gpio_scl=1
+# HiFiBerry sound detection disabled
+
+[cm5]
+dtoverlay=dwc2,dr_mode=host
+
+[all]
+dtparam=spi=off
+dtparam=i2c_arm=off
+""",
+]
+
+
+@pytest.mark.parametrize("content", DEFAULT_CONFIG_SAMPLES)
+def test_default_config_matches_individual_steps(tmp_path, content):
+    cfg = _cfg(tmp_path, content)
+    cfg.default_config()
+
+    expected = _cfg(tmp_path, content)
+    expected.remove_hifiberry_overlays()
+    expected.disable_onboard_sound()
+    expected.disable_hdmi_sound()
+    expected.enable_eeprom()
+    expected.enable_spi()
+    expected.enable_i2c()
+    expected.disable_hat_i2c()
+
+    assert cfg.lines == expected.lines
+
+
+def test_save_keeps_backup_when_file_is_replaced(tmp_path):
+    cfg = _cfg(tmp_path, "dtparam=audio=on\n")
+    (tmp_path / "config.txt.backup").write_text("stale\n")
+    cfg.disable_onboard_sound()
+    cfg.save()
+    assert (tmp_path / "config.txt").read_text() == "dtparam=audio=off\n"
+    assert (tmp_path / "config.txt.backup").read_text() == "dtparam=audio=on\n"
+    assert not (tmp_path / "config.txt.tmp").exists()
+
+
+def test_failed_save_removes_temporary_file(tmp_path, monkeypatch):
+    cfg = _cfg(tmp_path, "dtparam=audio=on\n")
+    cfg.enable_updi()
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("configurator.configtxt.os.replace", fail)
+    with pytest.raises(OSError):
+        cfg.save()
+    assert (tmp_path / "config.txt").read_text() == "dtparam=audio=on\n"
+    assert not (tmp_path / "config.txt.tmp").exists()
+
+
+def test_crlf_file_is_read_with_normalised_line_endings(tmp_path):
+    p = tmp_path / "config.txt"
+    p.write_bytes(b"dtparam=audio=on\r\n# form\x0cfeed\r\nenable_uart=0")
+    cfg = ConfigTxt(file_path=str(p))
+    assert cfg.lines == ["dtparam=audio=on\n", "# form\x0cfeed\n", "enable_uart=0"]
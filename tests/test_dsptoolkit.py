@@ -0,0 +1,129 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+from configurator import dsptoolkit
+from configurator.dsptoolkit import DSPToolkit
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode()
+
+
+class FakeSession:
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        if self.error:
+            raise self.error
+        return self.response
+
+
+def _use_session(monkeypatch, session):
+    monkeypatch.setattr(dsptoolkit, "_session", session)
+    monkeypatch.setattr(dsptoolkit, "_detect_cache", {})
+    return session
+
+
+def test_session_is_shared():
+    assert dsptoolkit._get_session() is dsptoolkit._get_session()
+
+
+def test_detect_dsp_uses_shared_session(monkeypatch):
+    session = _use_session(monkeypatch, FakeSession(
+        FakeResponse(payload={"detected_dsp": "ADAU1451", "status": "detected"})))
+    toolkit = DSPToolkit()
+    assert toolkit.get_detected_dsp_name() == "ADAU1451"
+    assert session.urls == ["http://localhost:13141/hardware/dsp"]
+
+
+def test_detect_dsp_connection_error(monkeypatch):
+    _use_session(monkeypatch, FakeSession(error=requests.exceptions.ConnectionError()))
+    toolkit = DSPToolkit()
+    assert toolkit.detect_dsp() is None
+    assert toolkit.get_dsp_status() == "unavailable"
+
+
+def test_detect_dsp_result_is_cached(monkeypatch):
+    session = _use_session(monkeypatch, FakeSession(
+        FakeResponse(payload={"detected_dsp": "ADAU1451", "status": "detected"})))
+    toolkit = DSPToolkit()
+    assert toolkit.is_dsp_detected()
+    assert toolkit.get_dsp_status() == "detected"
+    assert dsptoolkit.get_detected_dsp_name() == "ADAU1451"
+    assert len(session.urls) == 1
+
+    toolkit.invalidate()
+    toolkit.detect_dsp()
+    assert len(session.urls) == 2
+
+
+def test_detect_dsp_cache_expires(monkeypatch):
+    session = _use_session(monkeypatch, FakeSession(FakeResponse(payload={"status": "not_detected"})))
+    toolkit = DSPToolkit(cache_ttl=0)
+    toolkit.detect_dsp()
+    toolkit.detect_dsp()
+    assert len(session.urls) == 2
+
+
+def test_cli_status_only_queries_once(monkeypatch, capsys):
+    session = _use_session(monkeypatch, FakeSession(
+        FakeResponse(payload={"detected_dsp": "ADAU1451", "status": "detected"})))
+    monkeypatch.setattr("sys.argv", ["dsptoolkit", "--status-only"])
+    with pytest.raises(SystemExit) as exc:
+        dsptoolkit.main()
+    assert exc.value.code == 0
+    assert capsys.readouterr().out == "detected\n"
+    assert len(session.urls) == 1
+
+
+def test_cli_name_only_without_dsp(monkeypatch, capsys):
+    _use_session(monkeypatch, FakeSession(error=requests.exceptions.ConnectionError()))
+    monkeypatch.setattr("sys.argv", ["dsptoolkit", "--name-only"])
+    with pytest.raises(SystemExit) as exc:
+        dsptoolkit.main()
+    assert exc.value.code == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_detect_dsp_invalid_json(monkeypatch):
+    response = FakeResponse()
+    response.content = b"<html>"
+    _use_session(monkeypatch, FakeSession(response))
+    assert DSPToolkit().detect_dsp() is None
+
+
+def test_detect_dsp_retries_unavailable_service(monkeypatch):
+    statuses = [503, 200]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b'{"detected_dsp": "ADAU1451", "status": "detected"}'
+            self.send_response(statuses.pop(0))
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(dsptoolkit, "_detect_cache", {})
+    try:
+        toolkit = DSPToolkit("127.0.0.1", server.server_address[1])
+        assert toolkit.get_dsp_status() == "detected"
+        assert statuses == []
+    finally:
+        server.shutdown()
+        server.server_close()
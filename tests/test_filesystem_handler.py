@@ -0,0 +1,147 @@
+import json
+import os
+
+import pytest
+flask = pytest.importorskip("flask", reason="Flask is absent in the build chroot")
+
+from flask import Flask
+
+from configurator.handlers._util import encode_json
+from configurator.handlers.filesystem_handler import FilesystemHandler
+
+
+def _handler(tmp_path, allowed):
+    config = tmp_path / "configserver.json"
+    config.write_text(json.dumps({"filesystem": {"allowed_symlink_destinations": allowed}}))
+    return FilesystemHandler(config_file=str(config))
+
+
+def _call(fn, *args, **kwargs):
+    """Invoke a handler inside a request context and return (status, payload)."""
+    app = Flask(__name__)
+    with app.test_request_context(**kwargs):
+        result = fn(*args)
+    if isinstance(result, tuple):
+        response, status = result
+    else:
+        response, status = result, result.status_code
+    return status, json.loads(response.get_data(as_text=True))
+
+
+def _links_dir(tmp_path):
+    links = tmp_path / "links"
+    links.mkdir()
+    (tmp_path / "target.txt").write_text("x")
+    os.symlink("../target.txt", links / "b-good")
+    os.symlink(str(tmp_path / "missing"), links / "A-broken")
+    (links / "plain.txt").write_text("not a link")
+    return links
+
+
+def test_list_symlinks(tmp_path):
+    links = _links_dir(tmp_path)
+    handler = _handler(tmp_path, [str(links)])
+    status, payload = _call(handler.handle_list_symlinks, method="POST",
+                            json={"directory": str(links)})
+    assert status == 200
+    symlinks = payload["data"]["symlinks"]
+    assert [s["name"] for s in symlinks] == ["A-broken", "b-good"]
+    broken, good = symlinks
+    assert broken["target_exists"] is False
+    assert broken["absolute_target"] == str(tmp_path / "missing")
+    assert good["target_exists"] is True
+    assert good["target"] == "../target.txt"
+    assert good["absolute_target"] == str(tmp_path / "target.txt")
+    assert good["path"] == str(links / "b-good")
+    assert payload["data"]["count"] == 2
+
+
+def test_list_symlinks_outside_allowed_destinations(tmp_path):
+    links = _links_dir(tmp_path)
+    handler = _handler(tmp_path, [str(tmp_path / "other")])
+    status, payload = _call(handler.handle_list_symlinks, method="POST",
+                            json={"directory": str(links)})
+    assert status == 403
+    assert payload["error"] == "directory_not_allowed"
+
+
+def test_list_symlinks_rejects_parent_directory_escape(tmp_path):
+    links = _links_dir(tmp_path)
+    handler = _handler(tmp_path, [str(links)])
+    status, payload = _call(handler.handle_list_symlinks, method="POST",
+                            json={"directory": str(links) + "/.."})
+    assert status == 403
+    assert payload["error"] == "directory_not_allowed"
+
+
+def test_list_symlinks_rejects_sibling_with_shared_prefix(tmp_path):
+    links = _links_dir(tmp_path)
+    private = tmp_path / "links-private"
+    private.mkdir()
+    handler = _handler(tmp_path, [str(links)])
+    status, payload = _call(handler.handle_list_symlinks, method="POST",
+                            json={"directory": str(private)})
+    assert status == 403
+    assert payload["error"] == "directory_not_allowed"
+    status, _ = _call(handler.handle_list_symlinks, method="POST",
+                      json={"directory": str(links) + "/"})
+    assert status == 200
+
+
+def test_file_exists_rejects_sibling_with_shared_prefix(tmp_path):
+    handler = _handler(tmp_path, [])
+    status, payload = _call(handler.handle_file_exists, method="POST",
+                            json={"path": "/etcetera/passwd"})
+    assert status == 403
+    assert payload["error"] == "path_not_allowed"
+    for path in ("/etc", "/etc/hostname"):
+        status, _ = _call(handler.handle_file_exists, method="POST", json={"path": path})
+        assert status == 200
+
+
+def test_file_exists_rejects_parent_directory_escape(tmp_path):
+    handler = _handler(tmp_path, [])
+    status, payload = _call(handler.handle_file_exists, method="POST",
+                            json={"path": "/etc/../root/.ssh/id_rsa"})
+    assert status == 403
+    assert payload["error"] == "path_not_allowed"
+
+
+def test_config_is_parsed_once_until_changed(tmp_path, monkeypatch):
+    from configurator import config_parser
+
+    calls = []
+    real_loads = config_parser.decode_json
+
+    def counting_loads(data):
+        calls.append(data)
+        return real_loads(data)
+
+    monkeypatch.setattr(config_parser, "decode_json", counting_loads)
+    config = tmp_path / "configserver.json"
+    config.write_text(json.dumps({"filesystem": {"allowed_symlink_destinations": ["/a"]}}))
+
+    assert FilesystemHandler(config_file=str(config)).allowed_symlink_destinations == ["/a"]
+    assert FilesystemHandler(config_file=str(config)).allowed_symlink_destinations == ["/a"]
+    assert len(calls) == 1
+
+    config.write_text(json.dumps({"filesystem": {"allowed_symlink_destinations": ["/a", "/bb"]}}))
+    assert FilesystemHandler(config_file=str(config)).allowed_symlink_destinations == ["/a", "/bb"]
+    assert len(calls) == 2
+
+
+def test_missing_config_allows_nothing(tmp_path):
+    handler = FilesystemHandler(config_file=str(tmp_path / "missing.json"))
+    assert handler.allowed_symlink_destinations == []
+    assert handler.allowed_exists_check_destinations == ["/etc"]
+
+
+def test_list_symlinks_stream_matches_json_response(tmp_path):
+    links = _links_dir(tmp_path)
+    handler = _handler(tmp_path, [str(links)])
+    app = Flask(__name__)
+    with app.test_request_context(method="POST", json={"directory": str(links)}):
+        response = handler.handle_list_symlinks()
+        body = response.get_data()
+    assert response.mimetype == "application/json"
+    assert body == encode_json(json.loads(body))
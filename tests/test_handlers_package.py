@@ -0,0 +1,27 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import configurator.handlers as handlers
+
+
+def test_handlers_are_imported_lazily():
+    # Run in a fresh interpreter, other tests already imported handler modules
+    code = textwrap.dedent("""
+        import sys
+        import configurator.handlers as handlers
+        assert "ExtensionsHandler" in handlers.__all__
+        assert "configurator.handlers.extensions_handler" not in sys.modules
+        from configurator.handlers import ExtensionsHandler
+        assert "configurator.handlers.extensions_handler" in sys.modules
+        assert handlers.ExtensionsHandler is ExtensionsHandler
+        assert "configurator.handlers.smb_handler" not in sys.modules
+    """)
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_unknown_handler_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        handlers.NoSuchHandler
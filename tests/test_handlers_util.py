@@ -0,0 +1,74 @@
+import json
+
+import pytest
+pytest.importorskip("flask", reason="Flask is absent in the build chroot")
+
+from flask import Flask, jsonify
+
+from configurator.handlers._util import encode_json, json_response
+
+
+PAYLOAD = {"status": "success", "data": {"b": [1, 2], "a": None, "name": "Küche"}}
+
+
+def test_json_response_matches_jsonify_content():
+    app = Flask(__name__)
+    with app.app_context():
+        response = json_response(PAYLOAD, 201)
+        expected = jsonify(PAYLOAD)
+    assert response.status_code == 201
+    assert response.mimetype == "application/json"
+    assert json.loads(response.get_data()) == json.loads(expected.get_data())
+
+
+def test_json_response_accepts_encoded_body():
+    body = encode_json({"status": "error"})
+    response = json_response(body, 400)
+    assert response.get_data() == body
+    assert response.status_code == 400
+
+
+def test_orjson_provider_parses_request_bodies():
+    pytest.importorskip("orjson")
+    from flask import request
+    from configurator.handlers._util import ORJSONProvider
+
+    app = Flask(__name__)
+    app.json = ORJSONProvider(app)
+    with app.test_request_context(method="POST", json={"a": [1, 2]}):
+        assert request.get_json() == {"a": [1, 2]}
+    with app.test_request_context(method="POST", data="{bad", content_type="application/json"):
+        assert request.get_json(silent=True) is None
+
+
+def test_conditional_json_response_honours_if_none_match():
+    from configurator.handlers._util import conditional_json_response
+
+    body = encode_json(PAYLOAD)
+    app = Flask(__name__)
+    with app.test_request_context():
+        response = conditional_json_response(body)
+    assert response.status_code == 200
+    assert response.get_data() == body
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    with app.test_request_context(headers={"If-None-Match": etag}):
+        response = conditional_json_response(body)
+    assert response.status_code == 304
+
+    with app.test_request_context(headers={"If-None-Match": etag}):
+        response = conditional_json_response(encode_json({"other": 1}))
+    assert response.status_code == 200
+
+
+def test_error_response_includes_exception_text():
+    from configurator.handlers._util import error_response
+
+    with Flask(__name__).app_context():
+        response = error_response("Failed", ValueError("boom"), 503)
+        plain = error_response("Bad input", status=400)
+    assert response.status_code == 503
+    assert json.loads(response.get_data()) == {"status": "error", "message": "Failed", "error": "boom"}
+    assert plain.status_code == 400
+    assert json.loads(plain.get_data()) == {"status": "error", "message": "Bad input"}
@@ -0,0 +1,19 @@
+from configurator.hostconfig import sanitize_hostname, validate_hostname
+
+
+def test_validate_hostname():
+    assert validate_hostname("hifiberry")
+    assert validate_hostname("living-room-2")
+    assert not validate_hostname("")
+    assert not validate_hostname("-leading")
+    assert not validate_hostname("trailing-")
+    assert not validate_hostname("under_score")
+    assert not validate_hostname("a" * 65)
+    assert not validate_hostname("newline\n")
+
+
+def test_sanitize_hostname():
+    assert sanitize_hostname("Living Room") == "living-room"
+    assert sanitize_hostname("  Küche -- Box!  ") == "kche-box"
+    assert sanitize_hostname("!!!") == "hifiberry"
+    assert len(sanitize_hostname("x" * 100)) == 64
@@ -0,0 +1,148 @@
+import json
+
+import pytest
+flask = pytest.importorskip("flask", reason="Flask is absent in the build chroot")
+
+from flask import Flask
+
+from configurator.handlers import hostname_handler
+from configurator.handlers.hostname_handler import HostnameHandler
+
+
+def _call(fn, *args, **kwargs):
+    """Invoke a handler inside a request context and return (status, payload)."""
+    app = Flask(__name__)
+    with app.test_request_context(**kwargs):
+        result = fn(*args)
+    if isinstance(result, tuple):
+        response, status = result
+    else:
+        response, status = result, result.status_code
+    return status, json.loads(response.get_data(as_text=True))
+
+
+@pytest.fixture
+def hostnames(monkeypatch):
+    """Fake hostnamectl state; returns the list of lookups made"""
+    state = {"hostname": "hifiberry", "pretty": "HiFiBerry"}
+    lookups = []
+
+    def get_hostnames_with_fallback():
+        lookups.append(dict(state))
+        return state["hostname"], state["pretty"]
+
+    def set_hostname(hostname):
+        state["hostname"] = hostname
+        return True
+
+    def set_pretty(pretty):
+        state["pretty"] = pretty
+        return True
+
+    monkeypatch.setattr(hostname_handler, "_hostname_cache", None)
+    monkeypatch.setattr(hostname_handler, "_hostname_body", None)
+    monkeypatch.setattr(hostname_handler, "get_hostnames_with_fallback", get_hostnames_with_fallback)
+    monkeypatch.setattr(hostname_handler, "set_hostname_with_hosts_update", set_hostname)
+    monkeypatch.setattr(hostname_handler, "set_pretty_hostname", set_pretty)
+    return lookups
+
+
+def test_get_hostname_is_cached(hostnames):
+    handler = HostnameHandler()
+    for _ in range(3):
+        status, payload = _call(handler.handle_get_hostname)
+        assert status == 200
+        assert payload["data"] == {"hostname": "hifiberry", "pretty_hostname": "HiFiBerry"}
+    assert len(hostnames) == 1
+
+
+def test_set_hostname_updates_cache(hostnames):
+    handler = HostnameHandler()
+    _call(handler.handle_get_hostname)
+    status, payload = _call(handler.handle_set_hostname, method="POST",
+                            json={"pretty_hostname": "Living Room"})
+    assert status == 200
+    assert payload["data"] == {"hostname": "living-room", "pretty_hostname": "Living Room"}
+
+    lookups = len(hostnames)
+    status, payload = _call(handler.handle_get_hostname)
+    assert payload["data"] == {"hostname": "living-room", "pretty_hostname": "Living Room"}
+    assert len(hostnames) == lookups
+
+
+def test_partially_failed_set_hostname_invalidates_cache(hostnames, monkeypatch):
+    handler = HostnameHandler()
+    _call(handler.handle_get_hostname)
+    monkeypatch.setattr(hostname_handler, "set_pretty_hostname", lambda pretty: False)
+    status, _ = _call(handler.handle_set_hostname, method="POST",
+                      json={"hostname": "den", "pretty_hostname": "Den"})
+    assert status == 500
+
+    status, payload = _call(handler.handle_get_hostname)
+    assert payload["data"] == {"hostname": "den", "pretty_hostname": "HiFiBerry"}
+
+
+def test_set_hostname_requires_json(hostnames):
+    status, payload = _call(HostnameHandler().handle_set_hostname, method="POST", data="x")
+    assert status == 400
+    assert payload == {"status": "error", "message": "Content-Type must be application/json"}
+
+
+@pytest.mark.parametrize("body", ["{not json", "[1, 2]"])
+def test_set_hostname_rejects_non_object_body(hostnames, body):
+    status, payload = _call(HostnameHandler().handle_set_hostname, method="POST",
+                            data=body, content_type="application/json")
+    assert status == 400
+    assert payload["message"] == "Request body must be a JSON object"
+
+
+@pytest.mark.parametrize("body", ["", "{}"])
+def test_set_hostname_rejects_empty_body(hostnames, body):
+    status, payload = _call(HostnameHandler().handle_set_hostname, method="POST",
+                            data=body, content_type="application/json")
+    assert status == 400
+    assert payload["message"] == "Missing request body"
+
+
+def test_set_hostname_rejects_large_body(hostnames, monkeypatch):
+    monkeypatch.setattr(hostname_handler, "get_hostnames_with_fallback",
+                        lambda: pytest.fail("oversized request must not be processed"))
+    body = json.dumps({"hostname": "a" * hostname_handler.MAX_BODY_SIZE})
+    status, payload = _call(HostnameHandler().handle_set_hostname, method="POST",
+                            data=body, content_type="application/json")
+    assert status == 413
+    assert payload["message"] == "Request body too large"
+
+
+def test_set_pretty_hostname_does_not_reread(hostnames):
+    status, payload = _call(HostnameHandler().handle_set_hostname, method="POST",
+                            json={"pretty_hostname": "Kitchen"})
+    assert status == 200
+    assert payload["data"] == {"hostname": "kitchen", "pretty_hostname": "Kitchen"}
+    assert hostnames == []
+
+
+@pytest.mark.parametrize("content_type", ["application/json; charset=utf-8", "application/hostname+json"])
+def test_set_hostname_accepts_json_content_types(hostnames, content_type):
+    status, payload = _call(HostnameHandler().handle_set_hostname, method="POST",
+                            data='{"hostname": "den"}', content_type=content_type)
+    assert status == 200
+    assert payload["data"]["hostname"] == "den"
+
+
+def test_get_hostname_supports_etag(hostnames):
+    handler = HostnameHandler()
+    app = Flask(__name__)
+    with app.test_request_context():
+        etag = handler.handle_get_hostname().headers["ETag"]
+    with app.test_request_context(headers={"If-None-Match": etag}):
+        assert handler.handle_get_hostname().status_code == 304
+
+
+def test_get_hostname_reuses_encoded_body(hostnames, monkeypatch):
+    handler = HostnameHandler()
+    _call(handler.handle_get_hostname)
+    monkeypatch.setattr(hostname_handler, "encode_json",
+                        lambda payload: pytest.fail("unchanged hostnames must not be re-encoded"))
+    status, payload = _call(handler.handle_get_hostname)
+    assert payload["data"] == {"hostname": "hifiberry", "pretty_hostname": "HiFiBerry"}
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+
+import pytest
+
+from configurator import i2c
+
+
+class FakeSMBus:
+    present = {0x4d}
+    probes = []
+    open_buses = 0
+
+    def __init__(self, bus_number):
+        self.bus_number = bus_number
+        FakeSMBus.open_buses += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_byte(self, addr):
+        FakeSMBus.probes.append(addr)
+        if addr not in self.present:
+            raise OSError("no ack")
+        return 0
+
+    def close(self):
+        FakeSMBus.open_buses -= 1
+
+
+@pytest.fixture
+def fake_bus(monkeypatch):
+    FakeSMBus.probes = []
+    FakeSMBus.open_buses = 0
+    monkeypatch.setattr(i2c, "smbus2", type("smbus2", (), {"SMBus": FakeSMBus}))
+    real_exists = i2c.os.path.exists
+    monkeypatch.setattr(i2c.os.path, "exists",
+                        lambda path: path.startswith("/dev/i2c-") or real_exists(path))
+    return FakeSMBus
+
+
+def test_full_scan(fake_bus):
+    info = i2c.get_i2c_info(1)
+    assert info["detected_devices"] == ["0x4d"]
+    assert info["scan_range"] == "0x03-0x77"
+    assert len(fake_bus.probes) == 0x77 - 0x03 + 1
+    assert fake_bus.open_buses == 0
+
+
+def test_bus_is_closed_when_a_probe_fails(fake_bus, monkeypatch):
+    def broken_read_byte(self, addr):
+        raise RuntimeError("adapter gone")
+
+    monkeypatch.setattr(fake_bus, "read_byte", broken_read_byte)
+    info = i2c.get_i2c_info(1)
+    assert info["error"] == "adapter gone"
+    assert fake_bus.open_buses == 0
+
+
+def test_single_address_probe(fake_bus):
+    info = i2c.get_i2c_info(1, address=0x4d)
+    assert info["detected_devices"] == ["0x4d"]
+    assert info["scan_range"] == "0x4d"
+    assert fake_bus.probes == [0x4d]
+
+
+def _handler_module(monkeypatch):
+    pytest.importorskip("flask", reason="Flask is absent in the build chroot")
+    from configurator.handlers import i2c_handler
+    monkeypatch.setattr(i2c_handler, "_scan_cache", {})
+    return i2c_handler
+
+
+def test_handler_rejects_invalid_address(fake_bus, monkeypatch):
+    I2CHandler = _handler_module(monkeypatch).I2CHandler
+    from flask import Flask
+
+    app = Flask(__name__)
+    with app.test_request_context(query_string={"bus": "1", "address": "0x80"}):
+        response = I2CHandler().handle_get_i2c_devices()
+    assert response.status_code == 400
+    with app.test_request_context(query_string={"bus": "1", "address": "0x4d"}):
+        response = I2CHandler().handle_get_i2c_devices()
+    assert json.loads(response.get_data())["data"]["detected_devices"] == ["0x4d"]
+    assert fake_bus.probes == [0x4d]
+
+
+def test_handler_reuses_recent_scan(fake_bus, monkeypatch):
+    i2c_handler = _handler_module(monkeypatch)
+    from flask import Flask
+
+    app = Flask(__name__)
+    for _ in range(3):
+        with app.test_request_context(query_string={"bus": "1"}):
+            response = i2c_handler.I2CHandler().handle_get_i2c_devices()
+        assert json.loads(response.get_data())["data"]["detected_devices"] == ["0x4d"]
+    assert len(fake_bus.probes) == 0x77 - 0x03 + 1
+
+    monkeypatch.setattr(i2c_handler, "I2C_CACHE_TTL", 0)
+    with app.test_request_context(query_string={"bus": "1"}):
+        i2c_handler.I2CHandler().handle_get_i2c_devices()
+    assert len(fake_bus.probes) == 2 * (0x77 - 0x03 + 1)
+
+
+def test_concurrent_requests_share_one_scan(fake_bus, monkeypatch):
+    i2c_handler = _handler_module(monkeypatch)
+    from flask import Flask
+
+    real_get_i2c_info = i2c_handler.get_i2c_info
+    scans = []
+
+    def slow_get_i2c_info(bus_number, address):
+        scans.append(bus_number)
+        time.sleep(0.05)
+        return real_get_i2c_info(bus_number, address)
+
+    monkeypatch.setattr(i2c_handler, "get_i2c_info", slow_get_i2c_info)
+    app = Flask(__name__)
+
+    def request_scan():
+        with app.test_request_context(query_string={"bus": "1"}):
+            i2c_handler.I2CHandler().handle_get_i2c_devices()
+
+    threads = [threading.Thread(target=request_scan) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert scans == [1]
+
+
+def test_handler_rejects_invalid_bus(fake_bus, monkeypatch):
+    i2c_handler = _handler_module(monkeypatch)
+    from flask import Flask
+
+    with Flask(__name__).test_request_context(query_string={"bus": "11"}):
+        response = i2c_handler.I2CHandler().handle_get_i2c_devices()
+    assert response.status_code == 400
+    assert json.loads(response.get_data())["message"].startswith("Invalid bus number")
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+pytest.importorskip("flask", reason="Flask is absent in the build chroot")
+pytest.importorskip("netifaces", reason="netifaces is absent in the build chroot")
+
+from flask import Flask
+
+from configurator.handlers import network_handler
+from configurator.handlers.network_handler import NetworkHandler
+
+
+@pytest.fixture
+def network(monkeypatch, tmp_path):
+    resolv = tmp_path / "resolv.conf"
+    resolv.write_text("nameserver 1.1.1.1\n")
+    calls = []
+
+    def get_network_config():
+        calls.append(1)
+        return {"dns_servers": [resolv.read_text().split()[1]]}
+
+    monkeypatch.setattr(network_handler, "_network_cache", None)
+    monkeypatch.setattr(network_handler, "NETWORK_CONFIG_FILES", (str(resolv),))
+    monkeypatch.setattr(network_handler, "get_network_config", get_network_config)
+    return resolv, calls
+
+
+def _get():
+    app = Flask(__name__)
+    with app.test_request_context():
+        response = NetworkHandler().handle_get_network_config()
+    return response.status_code, json.loads(response.get_data())
+
+
+def test_network_config_is_cached(network):
+    resolv, calls = network
+    assert _get() == (200, {"status": "success", "data": {"dns_servers": ["1.1.1.1"]}})
+    _get()
+    assert len(calls) == 1
+
+
+def test_network_config_reloaded_after_file_change(network):
+    resolv, calls = network
+    _get()
+    resolv.write_text("nameserver 9.9.9.9\n")
+    assert _get()[1]["data"] == {"dns_servers": ["9.9.9.9"]}
+    assert len(calls) == 2
+
+
+def test_network_config_expires(network, monkeypatch):
+    resolv, calls = network
+    monkeypatch.setattr(network_handler, "NETWORK_CACHE_TTL", 0)
+    _get()
+    _get()
+    assert len(calls) == 2
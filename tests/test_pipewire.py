@@ -0,0 +1,48 @@
+import subprocess
+
+import pytest
+
+import pipewire
+
+
+@pytest.fixture
+def pw_cli(monkeypatch):
+    """Fake pw-cli; returns the list of argument vectors it was run with"""
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        if args[1:3] == ["list", "Node"]:
+            stdout = '\tnode.name = "alsa_output.hifiberry"\n\tnode.name = "Capture"\n'
+        elif args[1] == "info":
+            stdout = "\tvolume = 0.5\n"
+        else:
+            stdout = ""
+        return subprocess.CompletedProcess(args, 0, stdout=stdout)
+
+    monkeypatch.setattr(pipewire, "_pw_cli_path", "/usr/bin/pw-cli")
+    monkeypatch.setattr(pipewire.subprocess, "run", run)
+    return calls
+
+
+def test_pw_cli_is_resolved_once(monkeypatch):
+    lookups = []
+    monkeypatch.setattr(pipewire, "_pw_cli_path", None)
+    monkeypatch.setattr(pipewire.shutil, "which", lambda name: lookups.append(name) or "/usr/bin/pw-cli")
+    assert pipewire._pw_cli() == "/usr/bin/pw-cli"
+    assert pipewire._pw_cli() == "/usr/bin/pw-cli"
+    assert lookups == ["pw-cli"]
+
+
+def test_missing_pw_cli_does_not_fork(monkeypatch):
+    monkeypatch.setattr(pipewire, "_pw_cli_path", "")
+    monkeypatch.setattr(pipewire.subprocess, "run",
+                        lambda *a, **kw: pytest.fail("pw-cli must not be run"))
+    assert pipewire.get_volume_controls() == []
+    assert pipewire.get_volume("Master") is None
+    assert pipewire.set_volume("Master", 0.5) is False
+
+
+def test_get_volume_parses_info(pw_cli):
+    assert pipewire.get_volume("alsa_output.hifiberry") == 0.5
+    assert pw_cli == [["/usr/bin/pw-cli", "info", "alsa_output.hifiberry"]]
@@ -0,0 +1,66 @@
+import pytest
+
+from configurator import volume
+
+
+@pytest.fixture
+def card(monkeypatch):
+    """Fake sound card 0; returns the list of control listings made"""
+    listings = []
+
+    def list_available_controls(card_index=None):
+        listings.append(card_index)
+        return ["Digital", "Headphone"]
+
+    monkeypatch.setattr(volume, "_cached_headphone_controls", None)
+    monkeypatch.setattr(volume, "get_cached_card_index", lambda: 0)
+    monkeypatch.setattr(volume, "list_available_controls", list_available_controls)
+    return listings
+
+
+def test_headphone_controls_are_listed_once(card):
+    for _ in range(3):
+        assert volume.get_available_headphone_controls() == ["Headphone"]
+    assert card == [0]
+
+
+def test_failed_listing_is_not_cached(card, monkeypatch):
+    monkeypatch.setattr(volume, "list_available_controls",
+                        lambda card_index=None: card.append(card_index) or [])
+    assert volume.get_available_headphone_controls() == []
+    assert volume.get_available_headphone_controls() == []
+    assert card == [0, 0]
+
+
+@pytest.mark.parametrize("output, expected", [
+    ("Simple mixer control 'Master',0\n  Front Left: Playback 42 [65%] [on]\n", (True, "65")),
+    ("Simple mixer control 'PCM',0\n", (False, None)),
+])
+def test_read_pipewire_master_runs_amixer_once(monkeypatch, output, expected):
+    calls = []
+    monkeypatch.setattr(volume, "ALSA_AVAILABLE", False)
+    monkeypatch.setattr(volume.subprocess, "check_output",
+                        lambda cmd, **kwargs: calls.append(cmd) or output)
+    assert volume.read_pipewire_master() == expected
+    assert calls == ["amixer get Master"]
+
+
+def test_store_headphone_volume_writes_one_batch(card, monkeypatch):
+    batches = []
+
+    class FakeDB:
+        def set_many(self, pairs, secure=False):
+            batches.append(list(pairs))
+            return True
+
+        def set(self, key, value, secure=False):
+            pytest.fail("values must be written in one batch")
+
+    monkeypatch.setattr(volume, "ConfigDB", FakeDB)
+    monkeypatch.setattr(volume, "get_current_volume", lambda card_index, control: "40")
+    assert volume.store_headphone_volume() is True
+    assert batches == [[
+        (volume.HEADPHONE_VOLUME_DB_KEY, "40"),
+        (volume.HEADPHONE_VOLUME_CARD_DB_KEY, "0"),
+        (volume.HEADPHONE_VOLUME_CONTROL_DB_KEY, "Headphone"),
+    ]]
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+pytest.importorskip("flask", reason="Flask is absent in the build chroot")
+
+from flask import Flask
+
+from configurator.handlers import volume_handler
+from configurator.handlers.volume_handler import VolumeHandler
+
+
+def _call(fn, **kwargs):
+    """Invoke a handler inside a request context and return (status, payload)."""
+    with Flask(__name__).test_request_context(**kwargs):
+        result = fn()
+    if isinstance(result, tuple):
+        response, status = result
+    else:
+        response, status = result, result.status_code
+    return status, json.loads(response.get_data(as_text=True))
+
+
+@pytest.fixture
+def headphone(monkeypatch):
+    """Fake headphone control; returns the list of volumes set"""
+    volumes = []
+
+    def set_headphone_volume(volume):
+        volumes.append(volume)
+        return True
+
+    monkeypatch.setattr(volume_handler, "get_available_headphone_controls", lambda: ["Headphone"])
+    monkeypatch.setattr(volume_handler, "get_headphone_volume", lambda: ("40", "Headphone"))
+    monkeypatch.setattr(volume_handler, "set_headphone_volume", set_headphone_volume)
+    return volumes
+
+
+@pytest.mark.parametrize("body, message", [
+    ({"volume": 101}, "Volume must be between 0 and 100"),
+    ({"volume": "loud"}, "Volume must be a valid integer"),
+    ({"other": 1}, "volume parameter is required"),
+    ({"volume": [50]}, "Volume must be a valid integer"),
+    ({"volume": -1}, "Volume must be between 0 and 100"),
+])
+def test_set_headphone_volume_validation(headphone, body, message):
+    status, payload = _call(VolumeHandler().handle_set_headphone_volume, method="POST", json=body)
+    assert status == 400
+    assert payload == {"status": "error", "message": message}
+    assert headphone == []
+
+
+def test_set_headphone_volume(headphone):
+    status, payload = _call(VolumeHandler().handle_set_headphone_volume, method="POST",
+                            json={"volume": 55})
+    assert status == 200
+    assert payload["data"] == {"volume": 55}
+    assert headphone == ["55"]
+
+
+def test_missing_headphone_control_is_404(headphone, monkeypatch):
+    monkeypatch.setattr(volume_handler, "get_headphone_volume", lambda: (None, None))
+    status, payload = _call(VolumeHandler().handle_get_headphone_volume)
+    assert status == 404
+    assert payload["message"] == "No headphone volume controls available on this sound card"
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"data": "{broken", "content_type": "application/json"},
+    {"data": "volume=5", "content_type": "application/x-www-form-urlencoded"},
+    {"json": [55]},
+])
+def test_set_headphone_volume_rejects_unusable_body(headphone, kwargs):
+    status, payload = _call(VolumeHandler().handle_set_headphone_volume, method="POST", **kwargs)
+    assert status == 400
+    assert payload["message"] == "No JSON data provided"
+
+
+def test_handler_exceptions_become_error_responses(headphone, monkeypatch):
+    def broken():
+        raise RuntimeError("mixer gone")
+
+    monkeypatch.setattr(volume_handler, "get_headphone_volume", broken)
+    status, payload = _call(VolumeHandler().handle_get_headphone_volume)
+    assert status == 500
+    assert payload == {"status": "error", "message": "Failed to get headphone volume", "error": "mixer gone"}
+
+
+def test_get_headphone_volume_supports_etag(headphone):
+    handler = VolumeHandler()
+    app = Flask(__name__)
+    with app.test_request_context():
+        etag = handler.handle_get_headphone_volume().headers["ETag"]
+    with app.test_request_context(headers={"If-None-Match": etag}):
+        assert handler.handle_get_headphone_volume().status_code == 304
+    with app.test_request_context(headers={"If-None-Match": etag}):
+        assert handler.handle_list_headphone_controls().status_code == 200
+
+
+@pytest.mark.parametrize("value, expected", [(55, "55"), ("55", "55"), (55.9, "55")])
+def test_set_headphone_volume_accepts_int_like_values(headphone, value, expected):
+    status, _ = _call(VolumeHandler().handle_set_headphone_volume, method="POST", json={"volume": value})
+    assert status == 200
+    assert headphone == [expected]